@@ -6,23 +6,29 @@ Clean, modular architecture using Flask Blueprints:
 - routes/ - Organized API endpoints by resource
 - utils.py - Helper functions
 - error_handlers.py - Centralized error handling
+- config.py - Environment configuration
 - database.py - Database configuration
+- cache.py - Response caching
 - models.py - ORM models
-- service.py - Business logic
-- validators.py - Input validation
+- services/ - Business logic
+- validators/ - Input validation
 - exceptions.py - Custom exceptions
 """
 
 from flask import Flask
-import os
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (before config.py reads them)
 load_dotenv()
 
+from config import config
+
 # Import database configuration
 from database import init_db
 
+# Import response cache
+from cache import init_cache
+
 # Import blueprints
 from routes import books_bp, authors_bp, categories_bp, info_bp
 
@@ -30,21 +36,29 @@ from routes import books_bp, authors_bp, categories_bp, info_bp
 from error_handlers import register_error_handlers
 
 
-def create_app():
+def create_app(overrides: dict = None):
     """
     Application factory pattern
     
     Creates and configures the Flask application with all blueprints
     and error handlers registered.
     
+    Args:
+        overrides: Flask config values applied before the extensions are
+            initialized (e.g. a test's own SQLALCHEMY_DATABASE_URI)
+    
     Returns:
         Configured Flask application instance
     """
     app = Flask(__name__)
+    app.config.update(overrides or {})
     
     # Initialize database
     init_db(app)
     
+    # Initialize response cache
+    init_cache(app)
+    
     # Register blueprints
     app.register_blueprint(info_bp)        # Root routes (/, /health)
     app.register_blueprint(books_bp)       # /books/*
@@ -63,8 +77,8 @@ def print_startup_info(app):
     print("🚀 Book Library API with Database (Week 3 - Modular)")
     print("="*70)
     print(f"📊 Database: {app.config['SQLALCHEMY_DATABASE_URI']}")
-    print(f"🌐 Server: http://localhost:{os.environ.get('PORT', 5000)}")
-    print(f"🔧 Debug Mode: {os.environ.get('DEBUG', 'True') == 'True'}")
+    print(f"🌐 Server: http://localhost:{config.port}")
+    print(f"🔧 Debug Mode: {config.debug}")
     print("\n📁 Modular Structure:")
     print("  • routes/books.py - Book endpoints")
     print("  • routes/authors.py - Author endpoints")
@@ -78,11 +92,20 @@ def print_startup_info(app):
     print("  • Many-to-Many relationships (Books ↔ Categories)")
     print("  • Search and filtering")
     print("  • Pagination")
+    print("  • Cached list responses with ETags")
     print("  • Database migrations with Alembic")
     print("="*70 + "\n")
 
 
 if __name__ == '__main__':
+    # The Werkzeug server handles one request at a time; production runs
+    # under gunicorn instead (see gunicorn.conf.py)
+    if config.flask_env != 'development':
+        raise SystemExit(
+            "app.run() is for development only (set FLASK_ENV=development).\n"
+            "In production run: gunicorn 'app:create_app()'"
+        )
+    
     # Create application
     app = create_app()
     
@@ -90,7 +113,4 @@ if __name__ == '__main__':
     print_startup_info(app)
     
     # Run application
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('DEBUG', 'True') == 'True'
-    
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    app.run(host='0.0.0.0', port=config.port, debug=config.debug)
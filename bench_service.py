@@ -0,0 +1,183 @@
+"""
+Micro-benchmarks for the service layer
+
+Run against a throwaway SQLite database:
+    python bench_service.py
+    python bench_service.py --sizes 100,1000,10000 --repeat 5
+
+Each scenario builds its inputs in setup() from a seeded RNG, so every
+run times the same work; only run() is measured. Every repeat starts
+from freshly created tables.
+"""
+
+import abc
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from app import create_app
+from database import db
+from models import Author
+from services import BookService
+from validators import BookValidator
+
+
+class Scenario(abc.ABC):
+    """One timed operation over n generated inputs"""
+    
+    name = None
+    
+    def __init__(self, n: int, seed: int):
+        self.n = n
+        self.rng = random.Random(seed)
+    
+    def setup(self):
+        """Build inputs and existing rows (not timed)"""
+    
+    @abc.abstractmethod
+    def run(self):
+        """Perform the measured operation"""
+    
+    def create_authors(self, count: int = 100) -> list:
+        """Insert count authors and return their IDs"""
+        return list(db.session.scalars(
+            insert(Author).returning(Author.id, sort_by_parameter_order=True),
+            [{'name': f'Author {i:03d}'} for i in range(count)]
+        ))
+    
+    def generate_books(self, author_ids: list) -> list:
+        """Generate n valid book payloads with unique ISBNs"""
+        isbns = self.rng.sample(range(10**9, 10**10), self.n)
+        return [
+            {
+                'title': f'Book {i}',
+                'isbn': f'978{isbn}',
+                'year': self.rng.randint(2000, 2019),
+                'author_id': self.rng.choice(author_ids),
+                'pages': self.rng.randint(50, 900)
+            }
+            for i, isbn in enumerate(isbns)
+        ]
+
+
+class CreateBookScenario(Scenario):
+    """One create_book() call (and commit) per book"""
+    
+    name = 'create_book'
+    
+    def setup(self):
+        self.books = self.generate_books(self.create_authors())
+        db.session.commit()
+    
+    def run(self):
+        for data in self.books:
+            BookService.create_book(data)
+
+
+class CreateBooksBulkScenario(Scenario):
+    """create_books_bulk() in batches of the largest allowed size"""
+    
+    name = 'create_books_bulk'
+    
+    def setup(self):
+        self.books = self.generate_books(self.create_authors())
+        db.session.commit()
+    
+    def run(self):
+        size = BookValidator.MAX_BULK_BOOKS
+        for start in range(0, self.n, size):
+            BookService.create_books_bulk(self.books[start:start + size])
+
+
+class ListBooksScenario(CreateBooksBulkScenario):
+    """Walk every page of get_all_books() with keyset cursors"""
+    
+    name = 'get_all_books (cursor)'
+    per_page = 100
+    
+    def setup(self):
+        # The books are bulk-created up front; only the reads are timed
+        super().setup()
+        super().run()
+        db.session.expire_all()
+    
+    def run(self):
+        cursor = ''
+        while cursor is not None:
+            cursor = BookService.get_all_books(
+                per_page=self.per_page, cursor=cursor
+            )['next_cursor']
+
+
+SCENARIOS = [CreateBookScenario, CreateBooksBulkScenario, ListBooksScenario]
+
+
+def time_scenario(scenario_class, n: int, repeat: int, seed: int) -> list:
+    """
+    Time a scenario on its own temporary database
+    
+    Args:
+        scenario_class: Scenario subclass to run
+        n: Number of books the scenario works on
+        repeat: Number of timed runs
+        seed: RNG seed, shared by every run
+    
+    Returns:
+        Wall-clock seconds of each run
+    """
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    timings = []
+    
+    try:
+        with app.app_context():
+            for _ in range(repeat):
+                db.drop_all()
+                db.create_all()
+                
+                scenario = scenario_class(n, seed)
+                scenario.setup()
+                
+                start = time.perf_counter()
+                scenario.run()
+                timings.append(time.perf_counter() - start)
+                
+                db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+    
+    return timings
+
+
+def main():
+    """Run every scenario at each size and print the timings"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000',
+                        help='Comma-separated numbers of books (default: 100,1000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per scenario and size (default: 3)')
+    parser.add_argument('--seed', type=int, default=1234,
+                        help='RNG seed for the generated books (default: 1234)')
+    args = parser.parse_args()
+    
+    for scenario_class in SCENARIOS:
+        for n in (int(size) for size in args.sizes.split(',')):
+            timings = time_scenario(scenario_class, n, args.repeat, args.seed)
+            best = min(timings)
+            print(
+                f"{scenario_class.name:<24} N={n:<6} "
+                f"best {best * 1000:9.1f} ms  "
+                f"median {statistics.median(timings) * 1000:9.1f} ms  "
+                f"{best / n * 1e6:8.1f} us/book"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Response caching configuration
+
+This module caches the JSON responses of read-heavy list endpoints and
+adds ETag support so repeat clients can revalidate with a 304.
+"""
+
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, make_response
+from flask_caching import Cache
+
+from config import config
+
+# Initialize Flask-Caching
+cache = Cache()
+
+# Requests that change data and therefore invalidate cached listings
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# Listings (by blueprint) that show data written through each blueprint:
+# author and category listings show book counts, book listings show
+# authors and categories
+INVALIDATED_BY_WRITES = {
+    'books': ('books', 'authors', 'categories'),
+    'authors': ('authors', 'books'),
+    'categories': ('categories', 'books')
+}
+
+
+def init_cache(app):
+    """
+    Initialize response cache with Flask app
+    
+    Caching is off (NullCache) unless CACHE_TYPE is set. An in-process
+    SimpleCache only suits a single worker: a write handled by one
+    gunicorn worker can't invalidate the others' copies. With several
+    workers set CACHE_TYPE=RedisCache (plus CACHE_REDIS_URL) so they share
+    one cache.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.config.setdefault('CACHE_TYPE', config.cache_type)
+    app.config.setdefault('CACHE_DEFAULT_TIMEOUT', config.cache_default_timeout)
+    app.config.setdefault('CACHE_REDIS_URL', config.cache_redis_url)
+    # NullCache is the intended default, not a misconfiguration
+    app.config.setdefault('CACHE_NO_NULL_WARNING', True)
+    
+    cache.init_app(app)
+    
+    @app.after_request
+    def invalidate_on_write(response):
+        """Retire the cached listings a successful write affects"""
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            for namespace in INVALIDATED_BY_WRITES.get(request.blueprint, ()):
+                cache.set(_version_key(namespace), uuid.uuid4().hex, timeout=0)
+        return response
+
+
+def _version_key(namespace: str) -> str:
+    """Cache key holding a namespace's listing version"""
+    return f'list-version:{namespace}'
+
+
+def _namespace_version(namespace: str) -> str:
+    """
+    Get the current version of a namespace's cached listings
+    
+    The version is part of every listing's cache key, so replacing it
+    makes all of the namespace's entries unreachable at once (they expire
+    on their own). A missing version is replaced by a new one rather than
+    a default, so an evicted version can't bring back older entries.
+    
+    Args:
+        namespace: Blueprint name of the listing
+        
+    Returns:
+        Version token
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Another worker may be setting it at the same time; keep theirs
+        cache.add(key, uuid.uuid4().hex, timeout=0)
+        version = cache.get(key)
+    return version
+
+
+def _list_cache_key() -> str:
+    """Cache key for a listing: namespace version, path and sorted query"""
+    namespace = request.blueprint
+    query = urlencode(sorted(request.args.items(multi=True)))
+    query_hash = hashlib.md5(query.encode()).hexdigest()
+    return f'list:{namespace}:{_namespace_version(namespace)}:{request.path}:{query_hash}'
+
+
+def _is_cacheable(rv) -> bool:
+    """Only cache successful responses"""
+    return rv.status_code == 200
+
+
+def cached_list(view):
+    """
+    Cache a list endpoint's response per query string
+    
+    Entries are grouped by blueprint, so a write only retires the
+    listings it can have changed (see INVALIDATED_BY_WRITES). Cached
+    responses carry an ETag; requests sending a matching If-None-Match
+    header get an empty 304 instead of the full body.
+    
+    Args:
+        view: Flask view function
+    
+    Returns:
+        Wrapped view function
+    """
+    @cache.cached(key_prefix=_list_cache_key, response_filter=_is_cacheable)
+    @wraps(view)
+    def cached_view(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.add_etag()
+        return response
+    
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = cached_view(*args, **kwargs)
+        return response.make_conditional(request)
+    
+    return wrapper
@@ -0,0 +1,114 @@
+"""
+Application configuration
+
+Settings are read from the environment once, when this module is first
+imported (app.py loads .env before that happens), and shared as a single
+immutable object. Under gunicorn's preload_app every forked worker
+inherits the same parsed config.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import cache
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+
+def _env_flag(name: str, default: str = 'False') -> bool:
+    """Read a True/False environment variable"""
+    return os.environ.get(name, default) == 'True'
+
+
+@cache
+def normalize_database_url(url: str = None) -> str:
+    """
+    Turn a DATABASE_URL value into a SQLAlchemy connection string
+    
+    Args:
+        url: Value of DATABASE_URL, or None to use SQLite
+    
+    Returns:
+        Database connection string
+    """
+    if url:
+        # Fix for Heroku postgres:// -> postgresql://
+        if url.startswith('postgres://'):
+            url = url.replace('postgres://', 'postgresql://', 1)
+        return url
+    
+    # Default to SQLite for development
+    return f'sqlite:///{os.path.join(BASE_DIR, "library.db")}'
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings parsed from the environment"""
+    
+    # Server
+    port: int
+    debug: bool
+    flask_env: str
+    health_check_ttl: float
+    
+    # Database
+    database_url: str
+    sql_echo: bool
+    raiseload: bool
+    auto_create_tables: bool
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_recycle: int
+    db_insert_page_size: int
+    db_query_cache_size: int
+    pagination_count_total: bool
+    joined_author_max_per_page: int
+    read_statement_timeout_ms: int
+    
+    # Response cache
+    cache_type: str
+    cache_default_timeout: int
+    cache_redis_url: str
+    
+    @classmethod
+    def from_env(cls) -> 'Config':
+        """
+        Build configuration from environment variables
+        
+        Returns:
+            Config instance
+        """
+        return cls(
+            port=int(os.environ.get('PORT', 5000)),
+            debug=_env_flag('DEBUG', 'True'),
+            flask_env=os.environ.get('FLASK_ENV', 'production'),
+            # Seconds a passing /health check is reused (0 checks every probe)
+            health_check_ttl=float(os.environ.get('HEALTH_CHECK_TTL', 1.0)),
+            database_url=normalize_database_url(os.environ.get('DATABASE_URL')),
+            sql_echo=_env_flag('SQL_ECHO'),
+            raiseload=_env_flag('RAISELOAD'),
+            # Production schemas come from migrations ('flask db upgrade')
+            auto_create_tables=_env_flag(
+                'AUTO_CREATE_TABLES',
+                'True' if os.environ.get('FLASK_ENV') == 'development' else 'False'
+            ),
+            db_pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+            db_max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            db_pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            db_insert_page_size=int(os.environ.get('DB_INSERT_PAGE_SIZE', 10000)),
+            db_query_cache_size=int(os.environ.get('DB_QUERY_CACHE_SIZE', 1200)),
+            # Offset listings report total/pages unless a request opts out
+            pagination_count_total=_env_flag('PAGINATION_COUNT_TOTAL', 'True'),
+            # Larger book pages load authors with a separate IN query
+            joined_author_max_per_page=int(os.environ.get('JOINED_AUTHOR_MAX_PER_PAGE', 20)),
+            # PostgreSQL cancels listing queries running longer (0 disables)
+            read_statement_timeout_ms=int(os.environ.get('READ_STATEMENT_TIMEOUT_MS', 2000)),
+            # Off unless chosen: an in-process SimpleCache goes stale across
+            # gunicorn workers, so multi-worker setups need a shared cache
+            cache_type=os.environ.get('CACHE_TYPE', 'NullCache'),
+            cache_default_timeout=int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 30)),
+            cache_redis_url=os.environ.get('CACHE_REDIS_URL')
+        )
+
+
+# Loaded once per process
+config = Config.from_env()
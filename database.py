@@ -4,34 +4,97 @@ Database configuration and setup
 This module handles database connection, configuration, and initialization.
 """
 
-import os
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from flask_migrate import Migrate
 
+from config import config
+
 # Initialize SQLAlchemy and Flask-Migrate
 db = SQLAlchemy()
 migrate = Migrate()
 
 
-def get_database_url():
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Make SQLite enforce foreign keys, as PostgreSQL always does"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def get_engine_options(database_url):
     """
-    Get database URL from environment or use SQLite default
+    Build connection pool and batching options for the engine
+    
+    Each gunicorn worker gets its own pool, so the pool is sized per worker
+    thread rather than for the whole deployment. SQLite uses its own
+    pooling and only gets the health check.
     
+    With psycopg2, executemany() INSERTs are sent as multi-row VALUES pages
+    and UPDATE/DELETE batches go through execute_batch(), instead of one
+    round-trip per row.
+    
+    Compiled SQL is cached per statement shape; the cache is sized so the
+    filter/fieldset combinations of the list endpoints don't evict the
+    hot single-row lookups.
+    
+    Args:
+        database_url: Database connection string
+        
     Returns:
-        Database connection string
+        Dictionary of SQLAlchemy create_engine() options
+    """
+    # Test pooled connections on checkout so restarts don't surface as errors
+    options = {
+        'pool_pre_ping': True,
+        'query_cache_size': config.db_query_cache_size
+    }
+    
+    if not database_url.startswith('sqlite'):
+        options.update({
+            'pool_size': config.db_pool_size,
+            'max_overflow': config.db_max_overflow,
+            'pool_recycle': config.db_pool_recycle,
+            # Reuse the most recent connection so idle ones can time out
+            'pool_use_lifo': True
+        })
+    
+    # Resolve the driver the way create_engine will (the bare postgresql://
+    # default differs between SQLAlchemy releases)
+    if make_url(database_url).get_dialect().driver == 'psycopg2':
+        options.update({
+            'executemany_mode': 'values_plus_batch',
+            'insertmanyvalues_page_size': config.db_insert_page_size,
+            'executemany_batch_page_size': config.db_insert_page_size
+        })
+    
+    return options
+
+
+def warm_pool(app, connections: int):
     """
-    # Check for PostgreSQL connection string
-    postgres_url = os.environ.get('DATABASE_URL')
+    Open pooled connections before the first requests need them
     
-    if postgres_url:
-        # Fix for Heroku postgres:// -> postgresql://
-        if postgres_url.startswith('postgres://'):
-            postgres_url = postgres_url.replace('postgres://', 'postgresql://', 1)
-        return postgres_url
+    The connections are all checked out at once so the pool has to open
+    that many, then returned for reuse. SQLite has no server to connect
+    to and is skipped.
     
-    # Default to SQLite for development
-    basedir = os.path.abspath(os.path.dirname(__file__))
-    return f'sqlite:///{os.path.join(basedir, "library.db")}'
+    Args:
+        app: Flask application instance
+        connections: Number of connections to open
+    """
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            return
+        
+        held = [db.engine.connect() for _ in range(connections)]
+        for connection in held:
+            connection.close()
 
 
 def init_db(app):
@@ -41,15 +104,26 @@ def init_db(app):
     Args:
         app: Flask application instance
     """
-    # Set database configuration
-    app.config['SQLALCHEMY_DATABASE_URI'] = get_database_url()
+    # Set database configuration (unless the app factory was given one)
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', config.database_url)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = get_engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI']
+    )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['SQLALCHEMY_ECHO'] = os.environ.get('SQL_ECHO', 'False') == 'True'
+    app.config['SQLALCHEMY_ECHO'] = config.sql_echo
+    
+    # Fail fast on relationships that list queries didn't preload
+    app.config.setdefault('RAISELOAD', config.raiseload)
     
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)
     
-    # Create tables if they don't exist (for SQLite)
-    with app.app_context():
-        db.create_all()
+    # Create missing tables in development; elsewhere the schema is
+    # managed by migrations, so workers don't introspect it on boot
+    if config.auto_create_tables:
+        with app.app_context():
+            db.create_all()
+            
+            # Don't hand connections opened here to forked gunicorn workers
+            db.engine.dispose()
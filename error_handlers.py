@@ -1,10 +1,43 @@
 """
 Error handlers for the Flask application
 
-Centralized error handling for common HTTP errors.
+Centralized error handling for common HTTP errors and for the domain
+exceptions raised by the service layer, so routes don't catch them.
 """
 
-from utils import create_error_response
+from exceptions import (
+    BookLibraryError,
+    BookNotFoundError,
+    AuthorNotFoundError,
+    CategoryNotFoundError,
+    ValidationError,
+    DuplicateISBNError,
+    DuplicateCategoryError,
+    DatabaseError
+)
+from utils import create_error_response, encode_json, raw_json_response
+
+# HTTP status for each domain exception the services raise
+DOMAIN_ERROR_STATUS = {
+    ValidationError: 400,
+    DuplicateISBNError: 400,
+    DuplicateCategoryError: 400,
+    BookNotFoundError: 404,
+    AuthorNotFoundError: 404,
+    CategoryNotFoundError: 404,
+    DatabaseError: 500
+}
+
+
+def _error_body(message: str) -> bytes:
+    """Encode a fixed error payload once"""
+    return encode_json({'success': False, 'error': message})
+
+
+# Bodies for the generic errors, encoded once at import time
+_NOT_FOUND_BODY = _error_body("Resource not found")
+_METHOD_NOT_ALLOWED_BODY = _error_body("Method not allowed for this endpoint")
+_INTERNAL_ERROR_BODY = _error_body("Internal server error")
 
 
 def register_error_handlers(app):
@@ -15,17 +48,22 @@ def register_error_handlers(app):
         app: Flask application instance
     """
     
+    @app.errorhandler(BookLibraryError)
+    def domain_error(error):
+        """Map service exceptions to their HTTP status"""
+        return create_error_response(str(error), DOMAIN_ERROR_STATUS.get(type(error), 500))
+    
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors"""
-        return create_error_response("Resource not found", 404)
+        return raw_json_response(_NOT_FOUND_BODY, 404)
     
     @app.errorhandler(405)
     def method_not_allowed(error):
         """Handle 405 errors"""
-        return create_error_response("Method not allowed for this endpoint", 405)
+        return raw_json_response(_METHOD_NOT_ALLOWED_BODY, 405)
     
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors"""
-        return create_error_response("Internal server error", 500)
+        return raw_json_response(_INTERNAL_ERROR_BODY, 500)
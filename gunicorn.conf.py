@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration for production
+
+Run with:
+    gunicorn 'app:create_app()'
+
+Uses threaded (gthread) workers by default: every endpoint blocks on a
+database round-trip, so several threads per worker keep the CPU busy while
+other requests wait on I/O. Set GUNICORN_WORKER_CLASS=gevent (requires
+gevent) to serve many more concurrent connections per worker with
+greenlets instead.
+"""
+
+import multiprocessing
+import os
+from dotenv import load_dotenv
+
+# Load environment variables before the settings below read them (PORT in
+# .env would otherwise only take effect once app.py loads it)
+load_dotenv()
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker processes (sync-worker rule of thumb: 2 x cores + 1)
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 5))
+
+if worker_class == 'gevent':
+    # preload_app imports the app in the master, so blocking I/O has to be
+    # patched before that import rather than in the worker
+    from gevent import monkey
+    monkey.patch_all()
+    
+    # Concurrent greenlets per worker; size DB_POOL_SIZE to match
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Load the app once in the master and fork workers from it, so the
+# imported code and ORM metadata are shared copy-on-write
+preload_app = True
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Connect each worker's pool before it accepts requests"""
+    from config import config
+    from database import warm_pool
+    
+    # One connection per thread that can use it at once
+    connections = config.db_pool_size
+    if worker_class != 'gevent':
+        connections = min(threads, connections)
+    warm_pool(worker.wsgi, connections)
@@ -90,13 +90,27 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # indexes tagged with info['dialect'] (the PostgreSQL trigram indexes)
+    # are only created on that dialect, so don't report them missing elsewhere
+    def include_object(object, name, type_, reflected, compare_to):
+        dialect = object.info.get('dialect')
+        return dialect is None or dialect == connectable.dialect.name
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # the app turns SQLite foreign keys on for every connection; batch
+        # migrations rebuild tables and would trip them halfway through
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
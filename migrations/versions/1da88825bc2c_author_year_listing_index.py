@@ -0,0 +1,27 @@
+"""author year listing index
+
+Revision ID: 1da88825bc2c
+Revises: 6eeb4e3e7882
+Create Date: 2026-10-14 13:21:31.103568
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1da88825bc2c'
+down_revision = '6eeb4e3e7882'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_books_author_year', table_name='books')
+    op.create_index('ix_books_author_year_created', 'books',
+                    ['author_id', 'year', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_books_author_year_created', table_name='books')
+    op.create_index('ix_books_author_year', 'books', ['author_id', 'year'], unique=False)
@@ -0,0 +1,42 @@
+"""trigram search indexes
+
+Revision ID: 2d95f2161c49
+Revises: 92c0c03976d3
+Create Date: 2026-10-14 13:20:45.808027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d95f2161c49'
+down_revision = '92c0c03976d3'
+branch_labels = None
+depends_on = None
+
+
+# Trigram indexes only exist on PostgreSQL; other databases skip this revision
+TRIGRAM_INDEXES = (
+    ('ix_authors_name_trgm', 'authors', 'name'),
+    ('ix_books_title_trgm', 'books', 'title'),
+)
+
+
+def upgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(name, table, [column], unique=False,
+                        postgresql_using='gin',
+                        postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
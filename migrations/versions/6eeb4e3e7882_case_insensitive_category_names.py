@@ -0,0 +1,83 @@
+"""case-insensitive category names
+
+Revision ID: 6eeb4e3e7882
+Revises: 2d95f2161c49
+Create Date: 2026-10-14 13:21:13.939494
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6eeb4e3e7882'
+down_revision = '2d95f2161c49'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+categories = sa.table('categories',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+)
+book_categories = sa.table('book_categories',
+    sa.column('book_id', sa.Integer),
+    sa.column('category_id', sa.Integer),
+)
+
+
+def merge_case_duplicates():
+    """
+    Fold categories whose names differ only in case into the oldest one
+    
+    The unique index on name_lower can't be built while such names exist.
+    Books linked to a duplicate are relinked to the kept category, unless
+    they are already linked to it.
+    """
+    connection = op.get_bind()
+    keepers = {}
+    duplicates = {}
+    rows = connection.execute(
+        sa.select(categories.c.id, categories.c.name).order_by(categories.c.id)
+    )
+    for category_id, name in rows:
+        keeper = keepers.setdefault(name.lower(), category_id)
+        if keeper != category_id:
+            duplicates[category_id] = keeper
+
+    for duplicate, keeper in duplicates.items():
+        already_linked = sa.select(book_categories.c.book_id).where(
+            book_categories.c.category_id == keeper
+        )
+        connection.execute(
+            book_categories.update()
+            .where(book_categories.c.category_id == duplicate,
+                   book_categories.c.book_id.not_in(already_linked))
+            .values(category_id=keeper)
+        )
+        connection.execute(
+            book_categories.delete().where(book_categories.c.category_id == duplicate)
+        )
+        connection.execute(categories.delete().where(categories.c.id == duplicate))
+        logger.info('Merged category %s into %s (same name ignoring case)',
+                    duplicate, keeper)
+
+
+def upgrade():
+    merge_case_duplicates()
+
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.add_column(sa.Column(
+            'name_lower', sa.String(length=100),
+            sa.Computed('lower(name)', persisted=True), nullable=True
+        ))
+    op.create_index('ix_categories_name_lower', 'categories', ['name_lower'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_categories_name_lower', table_name='categories')
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.drop_column('name_lower')
@@ -0,0 +1,26 @@
+"""author name keyset index
+
+Revision ID: 92c0c03976d3
+Revises: fb4f5b481a8a
+Create Date: 2026-10-14 13:20:44.976875
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '92c0c03976d3'
+down_revision = 'fb4f5b481a8a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_authors_name', table_name='authors')
+    op.create_index('ix_authors_name_id', 'authors', ['name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_authors_name_id', table_name='authors')
+    op.create_index('ix_authors_name', 'authors', ['name'], unique=False)
@@ -0,0 +1,75 @@
+"""initial schema
+
+Revision ID: a61089ef481e
+Revises: 
+Create Date: 2026-10-14 13:18:59.003593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a61089ef481e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('authors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_authors_name', 'authors', ['name'], unique=False)
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_categories_name', 'categories', ['name'], unique=True)
+    op.create_table('books',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=300), nullable=False),
+    sa.Column('isbn', sa.String(length=13), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('pages', sa.Integer(), nullable=True),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_books_year', 'books', ['year'], unique=False)
+    op.create_index('ix_books_title', 'books', ['title'], unique=False)
+    op.create_index('ix_books_isbn', 'books', ['isbn'], unique=True)
+    op.create_index('ix_books_author_id', 'books', ['author_id'], unique=False)
+    op.create_table('book_categories',
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('book_id', 'category_id')
+    )
+
+
+def downgrade():
+    op.drop_table('book_categories')
+    op.drop_index('ix_books_author_id', table_name='books')
+    op.drop_index('ix_books_isbn', table_name='books')
+    op.drop_index('ix_books_title', table_name='books')
+    op.drop_index('ix_books_year', table_name='books')
+    op.drop_table('books')
+    op.drop_index('ix_categories_name', table_name='categories')
+    op.drop_table('categories')
+    op.drop_index('ix_authors_name', table_name='authors')
+    op.drop_table('authors')
@@ -0,0 +1,30 @@
+"""composite book indexes
+
+Revision ID: cf07279af2fb
+Revises: a61089ef481e
+Create Date: 2026-10-14 13:20:20.597428
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cf07279af2fb'
+down_revision = 'a61089ef481e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_books_author_id', table_name='books')
+    op.create_index('ix_books_author_year', 'books', ['author_id', 'year'], unique=False)
+    op.create_index('ix_books_created_at', 'books', ['created_at', 'id'], unique=False)
+    op.create_index('ix_book_categories_category_id', 'book_categories', ['category_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_book_categories_category_id', table_name='book_categories')
+    op.drop_index('ix_books_created_at', table_name='books')
+    op.drop_index('ix_books_author_year', table_name='books')
+    op.create_index('ix_books_author_id', 'books', ['author_id'], unique=False)
@@ -0,0 +1,41 @@
+"""timestamp server defaults
+
+Revision ID: fb4f5b481a8a
+Revises: cf07279af2fb
+Create Date: 2026-10-14 13:20:30.096715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fb4f5b481a8a'
+down_revision = 'cf07279af2fb'
+branch_labels = None
+depends_on = None
+
+
+# Timestamp columns that get a database-side default, per table
+TIMESTAMP_COLUMNS = {
+    'authors': ('created_at', 'updated_at'),
+    'categories': ('created_at',),
+    'books': ('created_at', 'updated_at'),
+    'book_categories': ('created_at',),
+}
+
+
+def upgrade():
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.DateTime(),
+                                      server_default=sa.func.now())
+
+
+def downgrade():
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.DateTime(),
+                                      server_default=None)
@@ -9,15 +9,106 @@ Demonstrates:
 - Model methods for serialization
 """
 
-from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import DDL, String, Text, event, func, select
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects import sqlite
 from database import db
 
 
+@lru_cache(maxsize=None)
+def column_serializer(names: tuple):
+    """
+    Compile a function that copies the named attributes into a dict
+    
+    The generated code is a single dict literal ({'id': obj.id, ...}),
+    so serializing a row runs no loop, getattr() or branch per field.
+    Serializers are built once per distinct attribute list.
+    
+    Args:
+        names: Attribute names (identifiers), in output order
+        
+    Returns:
+        Function taking a model instance and returning a dict
+    """
+    body = ', '.join(f'{name!r}: obj.{name}' for name in names)
+    namespace = {}
+    exec(f'def serialize(obj):\n    return {{{body}}}\n', namespace)
+    return namespace['serialize']
+
+
+# SQLite stores CURRENT_TIMESTAMP as text without fractional seconds; bind
+# datetimes in that same form so comparing a column with a value read back
+# from it (keyset pagination cursors) matches exactly
+Timestamp = db.DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format='%(year)04d-%(month)02d-%(day)02d '
+                       '%(hour)02d:%(minute)02d:%(second)02d'
+    ),
+    'sqlite'
+)
+
+
+class StrippedString(TypeDecorator):
+    """
+    String column that trims surrounding whitespace on the way in
+    
+    Blank values are stored as NULL, so every write path (services, bulk
+    inserts, seeding) normalizes text the same way without doing it by
+    hand per field.
+    """
+    impl = String
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return value.strip() or None
+
+
+class StrippedText(StrippedString):
+    """Text column that trims surrounding whitespace on the way in"""
+    impl = Text
+    cache_ok = True
+
+
+def trigram_index(name: str, column: str):
+    """
+    Build a PostgreSQL trigram (pg_trgm) GIN index on a text column
+    
+    Lets ILIKE '%term%' searches use an index instead of scanning the
+    table. Other databases skip the index; info['dialect'] tells
+    migrations/env.py to leave it out when comparing their schemas.
+    
+    Args:
+        name: Index name
+        column: Column name
+        
+    Returns:
+        Index construct
+    """
+    return db.Index(
+        name, column,
+        postgresql_using='gin',
+        postgresql_ops={column: 'gin_trgm_ops'},
+        info={'dialect': 'postgresql'}
+    ).ddl_if(dialect='postgresql')
+
+
+# The trigram operator classes come from the pg_trgm extension
+event.listen(
+    db.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
 # Association table for Many-to-Many relationship between Books and Categories
 book_categories = db.Table('book_categories',
     db.Column('book_id', db.Integer, db.ForeignKey('books.id'), primary_key=True),
     db.Column('category_id', db.Integer, db.ForeignKey('categories.id'), primary_key=True),
-    db.Column('created_at', db.DateTime, default=datetime.utcnow)
+    db.Column('created_at', Timestamp, server_default=func.now()),
+    # The primary key only serves book -> categories lookups
+    db.Index('ix_book_categories_category_id', 'category_id')
 )
 
 
@@ -30,28 +121,31 @@ class Author(db.Model):
     - Cascade delete (deleting author deletes their books)
     """
     __tablename__ = 'authors'
+    __table_args__ = (
+        # Alphabetical listing order, with id as a stable tie-breaker
+        db.Index('ix_authors_name_id', 'name', 'id'),
+        # Substring search on author name
+        trigram_index('ix_authors_name_trgm', 'name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False, index=True)
-    bio = db.Column(db.Text, nullable=True)
-    country = db.Column(db.String(100), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    name = db.Column(StrippedString(200), nullable=False)
+    bio = db.Column(StrippedText, nullable=True)
+    country = db.Column(StrippedString(100), nullable=True)
+    created_at = db.Column(Timestamp, server_default=func.now(), nullable=False)
+    updated_at = db.Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # Relationship: One author has many books
-    books = db.relationship('Book', backref='author', lazy='dynamic', cascade='all, delete-orphan')
+    books = db.relationship('Book', back_populates='author', lazy='select', cascade='all, delete-orphan')
+    
+    _serialize = staticmethod(column_serializer((
+        'id', 'name', 'bio', 'country', 'created_at', 'updated_at', 'book_count'
+    )))
+    _serialize_summary = staticmethod(column_serializer(('id', 'name', 'country')))
     
     def to_dict(self, include_books=False):
         """Convert author to dictionary"""
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'bio': self.bio,
-            'country': self.country,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'book_count': self.books.count()
-        }
+        data = self._serialize(self)
         
         if include_books:
             data['books'] = [book.to_dict(include_author=False) for book in self.books]
@@ -70,24 +164,28 @@ class Category(db.Model):
     - Many-to-Many relationship with Book
     """
     __tablename__ = 'categories'
+    __table_args__ = (
+        # Makes names case-insensitively unique
+        db.Index('ix_categories_name_lower', 'name_lower', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False, unique=True, index=True)
-    description = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    name = db.Column(StrippedString(100), nullable=False, unique=True, index=True)
+    # Generated by the database from name
+    name_lower = db.Column(db.String(100), db.Computed('lower(name)', persisted=True))
+    description = db.Column(StrippedText, nullable=True)
+    created_at = db.Column(Timestamp, server_default=func.now(), nullable=False)
     
     # Relationship: Many-to-Many with books
-    books = db.relationship('Book', secondary=book_categories, backref=db.backref('categories', lazy='dynamic'))
+    books = db.relationship('Book', secondary=book_categories, back_populates='categories', lazy='select')
+    
+    _serialize = staticmethod(column_serializer((
+        'id', 'name', 'description', 'created_at', 'book_count'
+    )))
     
     def to_dict(self, include_books=False):
         """Convert category to dictionary"""
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'book_count': len(self.books)
-        }
+        data = self._serialize(self)
         
         if include_books:
             data['books'] = [book.to_dict(include_categories=False, include_author=False) for book in self.books]
@@ -108,42 +206,62 @@ class Book(db.Model):
     - Indexes for search optimization
     """
     __tablename__ = 'books'
+    __table_args__ = (
+        # author_id filters (optionally with year), pre-sorted newest first
+        # within an author and year so the page is an index range scan
+        db.Index('ix_books_author_year_created', 'author_id', 'year', 'created_at', 'id'),
+        # Newest-first listing order, with id as a stable tie-breaker
+        db.Index('ix_books_created_at', 'created_at', 'id'),
+        # Substring search on title
+        trigram_index('ix_books_title_trgm', 'title'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(300), nullable=False, index=True)
+    title = db.Column(StrippedString(300), nullable=False, index=True)
     isbn = db.Column(db.String(13), unique=True, nullable=False, index=True)
     year = db.Column(db.Integer, nullable=False, index=True)
-    description = db.Column(db.Text, nullable=True)
+    description = db.Column(StrippedText, nullable=True)
     pages = db.Column(db.Integer, nullable=True)
     
     # Foreign key to Author
-    author_id = db.Column(db.Integer, db.ForeignKey('authors.id'), nullable=False, index=True)
-    
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Note: relationships are defined in Author and Category using backref
-    
-    def to_dict(self, include_author=True, include_categories=True):
-        """Convert book to dictionary"""
-        data = {
-            'id': self.id,
-            'title': self.title,
-            'isbn': self.isbn,
-            'year': self.year,
-            'description': self.description,
-            'pages': self.pages,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    author_id = db.Column(db.Integer, db.ForeignKey('authors.id'), nullable=False)
+    
+    created_at = db.Column(Timestamp, server_default=func.now(), nullable=False)
+    updated_at = db.Column(Timestamp, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships (mirrored on Author.books and Category.books via back_populates)
+    author = db.relationship('Author', back_populates='books', lazy='select')
+    categories = db.relationship('Category', secondary=book_categories, back_populates='books', lazy='select')
+    
+    # Columns serialized by to_dict, in output order
+    SERIALIZED_COLUMNS = ('id', 'title', 'isbn', 'year', 'description',
+                          'pages', 'created_at', 'updated_at')
+    _serialize = staticmethod(column_serializer(SERIALIZED_COLUMNS))
+    
+    def to_dict(self, include_author=True, include_categories=True, fields=None):
+        """
+        Convert book to dictionary
         
-        if include_author and self.author:
-            data['author'] = {
-                'id': self.author.id,
-                'name': self.author.name,
-                'country': self.author.country
-            }
+        Args:
+            include_author: Whether to nest the author
+            include_categories: Whether to nest the categories
+            fields: Optional set of field names to limit the output to;
+                attributes outside it are never touched, so they don't
+                need to be loaded
+        """
+        if fields is None:
+            data = self._serialize(self)
+            include_author_id = True
         else:
+            columns = tuple(name for name in self.SERIALIZED_COLUMNS if name in fields)
+            data = column_serializer(columns)(self)
+            include_author = include_author and 'author' in fields
+            include_categories = include_categories and 'categories' in fields
+            include_author_id = 'author_id' in fields
+        
+        if include_author and self.author:
+            data['author'] = self.author._serialize_summary(self.author)
+        elif include_author_id:
             data['author_id'] = self.author_id
         
         if include_categories:
@@ -153,3 +271,23 @@ class Book(db.Model):
     
     def __repr__(self):
         return f'<Book {self.title}>'
+
+
+# Book counts are loaded as correlated subqueries alongside each row, so
+# serializing a count never has to load the related books themselves.
+# Authors are also loaded as part of books, which never show the count, so
+# the author's count is deferred; queries that serialize it undefer it
+Author.book_count = db.column_property(
+    select(func.count(Book.id))
+    .where(Book.author_id == Author.id)
+    .correlate_except(Book)
+    .scalar_subquery(),
+    deferred=True
+)
+
+Category.book_count = db.column_property(
+    select(func.count(book_categories.c.book_id))
+    .where(book_categories.c.category_id == Category.id)
+    .correlate_except(book_categories)
+    .scalar_subquery()
+)
@@ -4,19 +4,14 @@ Book routes - Blueprint for all book-related endpoints
 
 from flask import Blueprint, request
 from services import BookService
-from exceptions import (
-    BookNotFoundError,
-    AuthorNotFoundError,
-    ValidationError,
-    DuplicateISBNError,
-    DatabaseError
-)
-from utils import create_success_response, create_error_response
+from utils import create_success_response, stream_json_response, expects_json
+from cache import cached_list
 
 books_bp = Blueprint('books', __name__, url_prefix='/books')
 
 
 @books_bp.route('', methods=['GET'])
+@cached_list
 def get_books():
     """
     Get all books with optional filtering, search, and pagination
@@ -28,45 +23,66 @@ def get_books():
     - category: Filter by category name
     - year: Filter by publication year
     - author_id: Filter by author ID
+    - fields: Comma-separated fields to return, e.g. title,isbn,author
+    - cursor: next_cursor from the previous page ('' for the first page);
+      seeks instead of counting and offsetting
+    - include_total: false skips counting total/pages (has_next is kept)
     """
-    try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        search = request.args.get('search', type=str)
-        category = request.args.get('category', type=str)
-        year = request.args.get('year', type=int)
-        author_id = request.args.get('author_id', type=int)
-        
-        result = BookService.get_all_books(
-            page=page,
-            per_page=per_page,
-            search=search,
-            category=category,
-            year=year,
-            author_id=author_id
-        )
-        
-        return create_success_response(data=result)
-    except ValidationError as e:
-        return create_error_response(str(e), 400)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    search = request.args.get('search', type=str)
+    category = request.args.get('category', type=str)
+    year = request.args.get('year', type=int)
+    author_id = request.args.get('author_id', type=int)
+    fields = request.args.get('fields', type=str)
+    cursor = request.args.get('cursor', type=str)
+    include_total = request.args.get('include_total', type=lambda v: v.lower() == 'true')
+    
+    result = BookService.get_all_books(
+        page=page,
+        per_page=per_page,
+        search=search,
+        category=category,
+        year=year,
+        author_id=author_id,
+        fields=fields,
+        cursor=cursor,
+        include_total=include_total
+    )
+    
+    return create_success_response(data=result)
+
+
+@books_bp.route('/export', methods=['GET'])
+def export_books():
+    """
+    Stream every matching book in a single unpaginated response
+    
+    Query parameters:
+    - search: Search in title/author name
+    - category: Filter by category name
+    - year: Filter by publication year
+    - author_id: Filter by author ID
+    """
+    books = BookService.iter_books(
+        search=request.args.get('search', type=str),
+        category=request.args.get('category', type=str),
+        year=request.args.get('year', type=int),
+        author_id=request.args.get('author_id', type=int)
+    )
+    return stream_json_response(books)
 
 
 @books_bp.route('/<int:book_id>', methods=['GET'])
 def get_book(book_id):
     """Get a specific book by ID"""
-    try:
-        book = BookService.get_book_by_id(book_id)
-        return create_success_response(data=book.to_dict())
-    except BookNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    book = BookService.get_book_by_id(book_id)
+    return create_success_response(data=book.to_dict())
 
 
 @books_bp.route('', methods=['POST'])
-def create_book():
+@expects_json
+def create_book(data):
     """
     Create a new book
     
@@ -81,61 +97,46 @@ def create_book():
     - pages: Number of pages
     - category_ids: Array of category IDs
     """
-    if not request.is_json:
-        return create_error_response("Content-Type must be application/json", 400)
+    book = BookService.create_book(data)
+    return create_success_response(
+        data=book.to_dict(),
+        message="Book created successfully",
+        status_code=201
+    )
+
+
+@books_bp.route('/bulk', methods=['POST'])
+@expects_json(body_type=list)
+def create_books_bulk(data):
+    """
+    Create many books at once
     
-    try:
-        data = request.get_json()
-        book = BookService.create_book(data)
-        return create_success_response(
-            data=book.to_dict(),
-            message="Book created successfully",
-            status_code=201
-        )
-    except ValidationError as e:
-        return create_error_response(str(e), 400)
-    except AuthorNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except DuplicateISBNError as e:
-        return create_error_response(str(e), 400)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    Expects a JSON array of book objects (same fields as POST /books).
+    Either every book is created or none is.
+    """
+    book_ids = BookService.create_books_bulk(data)
+    return create_success_response(
+        data={'ids': book_ids, 'count': len(book_ids)},
+        message=f"{len(book_ids)} book(s) created successfully",
+        status_code=201
+    )
 
 
 @books_bp.route('/<int:book_id>', methods=['PUT'])
-def update_book(book_id):
+@expects_json
+def update_book(data, book_id):
     """Update an existing book"""
-    if not request.is_json:
-        return create_error_response("Content-Type must be application/json", 400)
-    
-    try:
-        data = request.get_json()
-        book = BookService.update_book(book_id, data)
-        return create_success_response(
-            data=book.to_dict(),
-            message="Book updated successfully"
-        )
-    except BookNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except AuthorNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except ValidationError as e:
-        return create_error_response(str(e), 400)
-    except DuplicateISBNError as e:
-        return create_error_response(str(e), 400)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    book = BookService.update_book(book_id, data)
+    return create_success_response(
+        data=book.to_dict(),
+        message="Book updated successfully"
+    )
 
 
 @books_bp.route('/<int:book_id>', methods=['DELETE'])
 def delete_book(book_id):
     """Delete a book"""
-    try:
-        book = BookService.delete_book(book_id)
-        return create_success_response(
-            message=f'Book "{book.title}" deleted successfully'
-        )
-    except BookNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    book = BookService.delete_book(book_id)
+    return create_success_response(
+        message=f'Book "{book.title}" deleted successfully'
+    )
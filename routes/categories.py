@@ -4,44 +4,33 @@ Category routes - Blueprint for all category-related endpoints
 
 from flask import Blueprint, request
 from services import CategoryService
-from exceptions import (
-    CategoryNotFoundError,
-    ValidationError,
-    DuplicateCategoryError,
-    DatabaseError
-)
-from utils import create_success_response, create_error_response
+from utils import create_success_response, expects_json
+from cache import cached_list
 
 categories_bp = Blueprint('categories', __name__, url_prefix='/categories')
 
 
 @categories_bp.route('', methods=['GET'])
+@cached_list
 def get_categories():
     """Get all categories"""
-    try:
-        categories = CategoryService.get_all_categories()
-        return create_success_response(
-            data={'categories': [cat.to_dict() for cat in categories]}
-        )
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    categories = CategoryService.get_all_categories()
+    return create_success_response(
+        data={'categories': [cat.to_dict() for cat in categories]}
+    )
 
 
 @categories_bp.route('/<int:category_id>', methods=['GET'])
 def get_category(category_id):
     """Get a specific category by ID"""
-    try:
-        include_books = request.args.get('include_books', 'false').lower() == 'true'
-        category = CategoryService.get_category_by_id(category_id)
-        return create_success_response(data=category.to_dict(include_books=include_books))
-    except CategoryNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    include_books = request.args.get('include_books', 'false').lower() == 'true'
+    category = CategoryService.get_category_by_id(category_id, include_books)
+    return create_success_response(data=category.to_dict(include_books=include_books))
 
 
 @categories_bp.route('', methods=['POST'])
-def create_category():
+@expects_json
+def create_category(data):
     """
     Create a new category
     
@@ -51,34 +40,18 @@ def create_category():
     Optional fields:
     - description: Category description
     """
-    if not request.is_json:
-        return create_error_response("Content-Type must be application/json", 400)
-    
-    try:
-        data = request.get_json()
-        category = CategoryService.create_category(data)
-        return create_success_response(
-            data=category.to_dict(),
-            message="Category created successfully",
-            status_code=201
-        )
-    except ValidationError as e:
-        return create_error_response(str(e), 400)
-    except DuplicateCategoryError as e:
-        return create_error_response(str(e), 400)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    category = CategoryService.create_category(data)
+    return create_success_response(
+        data=category.to_dict(),
+        message="Category created successfully",
+        status_code=201
+    )
 
 
 @categories_bp.route('/<int:category_id>', methods=['DELETE'])
 def delete_category(category_id):
     """Delete a category"""
-    try:
-        category = CategoryService.delete_category(category_id)
-        return create_success_response(
-            message=f'Category "{category.name}" deleted successfully'
-        )
-    except CategoryNotFoundError as e:
-        return create_error_response(str(e), 404)
-    except DatabaseError as e:
-        return create_error_response(str(e), 500)
+    category = CategoryService.delete_category(category_id)
+    return create_success_response(
+        message=f'Category "{category.name}" deleted successfully'
+    )
@@ -2,64 +2,126 @@
 Info routes - Blueprint for informational endpoints (home, health check)
 """
 
-from flask import Blueprint, jsonify
+import hashlib
+import threading
+import time
+
+from flask import Blueprint, current_app, request
+from config import config
 from database import db
+from utils import encode_json, json_response, raw_json_response
 
 info_bp = Blueprint('info', __name__)
 
 
+# Static payloads are encoded once at import time
+_HOME_BODY = encode_json({
+    'message': 'Book Library API with Database',
+    'version': '3.0',
+    'database': 'PostgreSQL/SQLite',
+    'features': [
+        'SQLAlchemy ORM',
+        'Database relationships',
+        'Search and filtering',
+        'Pagination',
+        'Batched multi-row inserts (insertmanyvalues)',
+        'Multiple entities (Books, Authors, Categories)'
+    ],
+    'endpoints': {
+        'books': {
+            'GET /books': 'List books (with search, filter, pagination)',
+            'GET /books/export': 'Stream all matching books (unpaginated)',
+            'GET /books/:id': 'Get specific book',
+            'POST /books': 'Create book',
+            'POST /books/bulk': 'Create many books in one request',
+            'PUT /books/:id': 'Update book',
+            'DELETE /books/:id': 'Delete book'
+        },
+        'authors': {
+            'GET /authors': 'List authors (with pagination)',
+            'GET /authors/:id': 'Get specific author',
+            'POST /authors': 'Create author',
+            'PUT /authors/:id': 'Update author',
+            'DELETE /authors/:id': 'Delete author'
+        },
+        'categories': {
+            'GET /categories': 'List all categories',
+            'GET /categories/:id': 'Get specific category',
+            'POST /categories': 'Create category',
+            'DELETE /categories/:id': 'Delete category'
+        }
+    }
+})
+
+_HOME_ETAG = hashlib.md5(_HOME_BODY).hexdigest()
+
+_HEALTHY_BODY = encode_json({
+    'status': 'healthy',
+    'database': 'connected'
+})
+
+
+class HealthCheckState:
+    """
+    When the database last passed a health check
+    
+    Load balancers probe /health several times a second, so a passing
+    check is trusted for ttl seconds before the database is queried again.
+    Each app keeps its own state in app.extensions['health_check'];
+    threaded workers share it, hence the lock.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._last_ok_ts = None
+    
+    def is_fresh(self, now: float) -> bool:
+        """Check whether the last passing check is less than ttl seconds old"""
+        with self._lock:
+            return self._last_ok_ts is not None and now - self._last_ok_ts < self.ttl
+    
+    def record_ok(self, now: float):
+        """Remember a passing check"""
+        with self._lock:
+            self._last_ok_ts = now
+    
+    def reset(self):
+        """Forget the last passing check"""
+        with self._lock:
+            self._last_ok_ts = None
+
+
+@info_bp.record_once
+def _init_health_check(setup_state):
+    """Give each app that registers the blueprint its own health check state"""
+    setup_state.app.extensions['health_check'] = HealthCheckState(config.health_check_ttl)
+
+
 @info_bp.route('/', methods=['GET'])
 def home():
-    """API information endpoint"""
-    return jsonify({
-        'message': 'Book Library API with Database',
-        'version': '3.0',
-        'database': 'PostgreSQL/SQLite',
-        'features': [
-            'SQLAlchemy ORM',
-            'Database relationships',
-            'Search and filtering',
-            'Pagination',
-            'Multiple entities (Books, Authors, Categories)'
-        ],
-        'endpoints': {
-            'books': {
-                'GET /books': 'List books (with search, filter, pagination)',
-                'GET /books/:id': 'Get specific book',
-                'POST /books': 'Create book',
-                'PUT /books/:id': 'Update book',
-                'DELETE /books/:id': 'Delete book'
-            },
-            'authors': {
-                'GET /authors': 'List authors (with pagination)',
-                'GET /authors/:id': 'Get specific author',
-                'POST /authors': 'Create author',
-                'PUT /authors/:id': 'Update author',
-                'DELETE /authors/:id': 'Delete author'
-            },
-            'categories': {
-                'GET /categories': 'List all categories',
-                'GET /categories/:id': 'Get specific category',
-                'POST /categories': 'Create category',
-                'DELETE /categories/:id': 'Delete category'
-            }
-        }
-    }), 200
+    """API information endpoint (revalidates with If-None-Match)"""
+    response = raw_json_response(_HOME_BODY)
+    response.set_etag(_HOME_ETAG)
+    return response.make_conditional(request)
 
 
 @info_bp.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (healthy results are reused for HEALTH_CHECK_TTL)"""
+    state = current_app.extensions['health_check']
+    now = time.monotonic()
+    if state.is_fresh(now):
+        return raw_json_response(_HEALTHY_BODY)
+    
     try:
         # Test database connection
         db.session.execute(db.text('SELECT 1'))
-        return jsonify({
-            'status': 'healthy',
-            'database': 'connected'
-        }), 200
+        state.record_ok(now)
+        return raw_json_response(_HEALTHY_BODY)
     except Exception as e:
-        return jsonify({
+        return json_response({
             'status': 'unhealthy',
             'database': 'disconnected',
             'error': str(e)
-        }), 500
+        }, 500)
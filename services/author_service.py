@@ -6,10 +6,12 @@ and error handling.
 """
 
 from typing import Dict
+from sqlalchemy import exists, select, tuple_, update
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload, undefer
 
 from database import db
-from models import Author
+from models import Author, Book
 from validators import AuthorValidator, PaginationValidator
 from exceptions import (
     AuthorNotFoundError,
@@ -23,13 +25,20 @@ class AuthorService(BaseService):
     """Service for author operations"""
     
     @staticmethod
-    def get_all_authors(page: int = 1, per_page: int = 10) -> Dict:
+    def get_all_authors(page: int = 1, per_page: int = 10,
+                        cursor: str = None, include_total: bool = None) -> Dict:
         """
         Get all authors with pagination
         
+        Passing cursor switches to keyset pagination on (name, id): no
+        OFFSET scan and no COUNT query. Offset pages skip the COUNT too
+        when include_total is False.
+        
         Args:
             page: Page number (1-indexed)
             per_page: Items per page
+            cursor: next_cursor of the previous page ('' for the first)
+            include_total: Count total/pages (default: PAGINATION_COUNT_TOTAL)
             
         Returns:
             Dictionary with authors and pagination info
@@ -37,22 +46,68 @@ class AuthorService(BaseService):
         # Validate pagination
         page, per_page = PaginationValidator.validate_pagination(page, per_page)
         
-        try:
-            paginated = Author.query.order_by(Author.name).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+        # Read plain rows instead of hydrating Author objects: the listing
+        # only serializes columns
+        query = (
+            select(
+                Author.id,
+                Author.name,
+                Author.bio,
+                Author.country,
+                Author.created_at,
+                Author.updated_at,
+                Author.book_count.label('book_count')
             )
+            .order_by(Author.name, Author.id)
+        )
+        
+        AuthorService.limit_read_time()
+        
+        if cursor is not None:
+            after = PaginationValidator.validate_cursor(cursor, str, int)
+            return AuthorService._get_authors_after(query, after, per_page)
+        
+        try:
+            total = None
+            if AuthorService.resolve_include_total(include_total):
+                total = AuthorService.fast_count(select(Author.id))
             
-            return {
-                'authors': [author.to_dict() for author in paginated.items],
-                'total': paginated.total,
-                'page': page,
-                'per_page': per_page,
-                'pages': paginated.pages
-            }
+            rows = db.session.execute(
+                query.limit(per_page + 1).offset((page - 1) * per_page)
+            ).all()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch authors: {str(e)}")
+        
+        return AuthorService.build_offset_response(
+            [row._asdict() for row in rows], page, per_page, 'authors', total
+        )
+    
+    @staticmethod
+    def _get_authors_after(query, after: tuple, per_page: int) -> Dict:
+        """
+        Fetch the page of authors following a keyset cursor
+        
+        Args:
+            query: Author listing query, ordered by (name, id)
+            after: (name, id) of the last author already returned,
+                or None for the first page
+            per_page: Items per page
+            
+        Returns:
+            Dictionary with authors and the cursor for the next page
+        """
+        if after is not None:
+            query = query.where(tuple_(Author.name, Author.id) > after)
+        
+        try:
+            rows = db.session.execute(query.limit(per_page + 1)).all()
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch authors: {str(e)}")
+        
+        return AuthorService.build_keyset_response(
+            [row._asdict() for row in rows], per_page, 'authors',
+            lambda author: [author['name'], author['id']]
+        )
     
     @staticmethod
     def get_author_by_id(author_id: int, include_books: bool = False) -> Author:
@@ -69,7 +124,12 @@ class AuthorService(BaseService):
         Raises:
             AuthorNotFoundError: If author doesn't exist
         """
-        author = db.session.get(Author, author_id)
+        options = [undefer(Author.book_count)]
+        if include_books:
+            # Books are serialized with their categories
+            options.append(selectinload(Author.books).selectinload(Book.categories))
+        
+        author = db.session.get(Author, author_id, options=options)
         if not author:
             raise AuthorNotFoundError(author_id)
         return author
@@ -91,26 +151,20 @@ class AuthorService(BaseService):
         # Validate data
         AuthorValidator.validate_author_data(data)
         
-        try:
+        with AuthorService.transaction("Failed to create author"):
             # Create author object
             author = AuthorService._create_author_object(data)
-            
             db.session.add(author)
-            db.session.commit()
-            
-            return author
-            
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"Failed to create author: {str(e)}")
+        
+        return author
     
     @staticmethod
     def _create_author_object(data: dict) -> Author:
         """Create author object from data"""
         return Author(
-            name=data['name'].strip(),
-            bio=data.get('bio', '').strip() if data.get('bio') else None,
-            country=data.get('country', '').strip() if data.get('country') else None
+            name=data['name'],
+            bio=data.get('bio'),
+            country=data.get('country')
         )
     
     @staticmethod
@@ -128,31 +182,27 @@ class AuthorService(BaseService):
         # Validate data
         AuthorValidator.validate_author_data(data, is_update=True)
         
-        # Get the author
-        author = AuthorService.get_author_by_id(author_id)
+        # Write only the submitted columns, without loading the author first
+        changes = AuthorService._author_changes(data)
+        if changes:
+            with AuthorService.transaction("Failed to update author"):
+                result = db.session.execute(
+                    update(Author).where(Author.id == author_id).values(**changes),
+                    execution_options={'synchronize_session': False}
+                )
+                if result.rowcount == 0:
+                    raise AuthorNotFoundError(author_id)
         
-        try:
-            # Update fields
-            AuthorService._update_author_fields(author, data)
-            
-            db.session.commit()
-            return author
-            
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"Failed to update author: {str(e)}")
+        return AuthorService.get_author_by_id(author_id)
     
     @staticmethod
-    def _update_author_fields(author: Author, data: dict):
-        """Update individual author fields from data"""
-        if 'name' in data:
-            author.name = data['name'].strip()
-        
-        if 'bio' in data:
-            author.bio = data['bio'].strip() if data['bio'] else None
-        
-        if 'country' in data:
-            author.country = data['country'].strip() if data['country'] else None
+    def _author_changes(data: dict) -> dict:
+        """Collect the author columns to update from data"""
+        return {
+            field: data[field]
+            for field in ('name', 'bio', 'country')
+            if field in data
+        }
     
     @staticmethod
     def delete_author(author_id: int) -> Author:
@@ -168,14 +218,21 @@ class AuthorService(BaseService):
         Raises:
             ValidationError: If author has books
         """
-        author = AuthorService.get_author_by_id(author_id)
+        # book_count is deferred; an EXISTS probe stops at the first
+        # matching index entry
+        author = db.session.get(Author, author_id)
+        if not author:
+            raise AuthorNotFoundError(author_id)
         
         # Check if author has books
-        book_count = author.books.count()
-        if book_count > 0:
+        has_books = db.session.execute(
+            select(exists().where(Book.author_id == author_id))
+        ).scalar()
+        if has_books:
+            # Only count them for the error message
             raise ValidationError(
                 f"Cannot delete author with existing books. "
-                f"Delete {book_count} book(s) first."
+                f"Delete {author.book_count} book(s) first."
             )
         
         return AuthorService.safe_delete(author, "Failed to delete author")
\ No newline at end of file
@@ -4,38 +4,114 @@ Base service class with common functionality
 Provides shared utilities and patterns for all services.
 """
 
-from typing import Dict
-from sqlalchemy.exc import SQLAlchemyError
+import re
+from base64 import urlsafe_b64encode
+from contextlib import contextmanager
+from dataclasses import dataclass
+from math import ceil
+from typing import Any, Callable, Dict, List
+
+import orjson
+from flask import current_app
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import raiseload
+from config import config
 from database import db
 from exceptions import DatabaseError
 
 
+# Table a failing INSERT or UPDATE statement writes to
+_WRITTEN_TABLE = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class ConstraintViolation:
+    """
+    A unique or foreign key constraint on one column
+    
+    Used as a key of transaction()'s constraint_errors, to map violations
+    of that constraint (and only that one) to a domain error.
+    """
+    kind: str       # 'unique' or 'foreign_key'
+    table: str
+    column: str
+    
+    def matches(self, error: IntegrityError) -> bool:
+        """
+        Check whether an IntegrityError violated this constraint
+        
+        PostgreSQL reports the SQLSTATE, table and offending key. SQLite
+        names the column of a failed unique constraint, but says nothing
+        about which foreign key failed, so that is matched by the table
+        the failing statement wrote to.
+        
+        Args:
+            error: Error raised by the statement or commit
+            
+        Returns:
+            True if this constraint was violated
+        """
+        diag = getattr(error.orig, 'diag', None)
+        if diag is not None:
+            sqlstate = '23505' if self.kind == 'unique' else '23503'
+            return (error.orig.pgcode == sqlstate
+                    and diag.table_name == self.table
+                    and (diag.message_detail or '').startswith(f'Key ({self.column})='))
+        
+        message = str(error.orig)
+        if self.kind == 'unique':
+            return f'UNIQUE constraint failed: {self.table}.{self.column}' in message
+        written = _WRITTEN_TABLE.match(error.statement or '')
+        return ('FOREIGN KEY constraint failed' in message
+                and written is not None and written.group(1) == self.table)
+
+
 class BaseService:
     """Base service with common database operations"""
     
     @staticmethod
-    def commit_or_rollback(error_message: str = "Database operation failed"):
+    @contextmanager
+    def transaction(error_message: str = "Database operation failed",
+                    constraint_errors: Dict[ConstraintViolation, Any] = None):
         """
-        Context manager for database transactions
+        Context manager that commits the block's changes, or rolls back
+        
+        Any exception raised in the block (or by the commit) rolls the
+        session back. A violation of one of the constraints in
+        constraint_errors raises the mapped error; every other database
+        error is re-raised as DatabaseError. Other exceptions propagate
+        unchanged.
         
         Usage:
-            with BaseService.commit_or_rollback("Failed to create record"):
+            with BaseService.transaction("Failed to create record"):
                 db.session.add(record)
-                db.session.commit()
+        
+        Args:
+            error_message: Prefix for the DatabaseError message
+            constraint_errors: Exception to raise for each constraint, or a
+                callable run after the rollback that returns one (or None
+                to fall back to DatabaseError)
         """
-        class TransactionContext:
-            def __enter__(self):
-                return self
-            
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                if exc_type is not None:
-                    db.session.rollback()
-                    if isinstance(exc_val, SQLAlchemyError):
-                        raise DatabaseError(f"{error_message}: {str(exc_val)}")
-                    return False
-                return True
-        
-        return TransactionContext()
+        try:
+            yield db.session
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            for violation, domain_error in (constraint_errors or {}).items():
+                if violation.matches(e):
+                    if callable(domain_error):
+                        domain_error = domain_error()
+                    if domain_error is not None:
+                        raise domain_error
+                    break
+            raise DatabaseError(f"{error_message}: {str(e)}")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError(f"{error_message}: {str(e)}")
+        except Exception:
+            db.session.rollback()
+            raise
     
     @staticmethod
     def safe_delete(entity, error_message: str = "Failed to delete"):
@@ -49,27 +125,121 @@ class BaseService:
         Returns:
             The deleted entity
         """
-        try:
+        with BaseService.transaction(error_message):
             db.session.delete(entity)
-            db.session.commit()
-            return entity
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"{error_message}: {str(e)}")
+        return entity
     
     @staticmethod
-    def safe_commit(error_message: str = "Failed to commit changes"):
+    def list_loader_options(*options) -> tuple:
         """
-        Safely commit changes with rollback on error
+        Build loader options for list queries
+        
+        When RAISELOAD is enabled, a raiseload('*') guard is appended so
+        touching any relationship that wasn't explicitly preloaded raises
+        instead of silently issuing one query per row.
         
         Args:
-            error_message: Custom error message
+            options: Explicit eager-loading options for the query
+            
+        Returns:
+            Tuple of loader options
         """
-        try:
-            db.session.commit()
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"{error_message}: {str(e)}")
+        if current_app.config.get('RAISELOAD'):
+            return options + (raiseload('*'),)
+        return options
+    
+    @staticmethod
+    def fast_count(query) -> int:
+        """
+        Count the rows a filtered select would return
+        
+        Runs SELECT count(*) over the select's own FROM/WHERE, without its
+        ORDER BY or column list, rather than counting a subquery of full
+        rows. That leaves the database free to answer from an index.
+        Not for selects using DISTINCT or GROUP BY.
+        
+        Args:
+            query: Filtered select statement
+            
+        Returns:
+            Number of matching rows
+        """
+        counted = query.order_by(None).with_only_columns(
+            func.count(), maintain_column_froms=True
+        )
+        return db.session.execute(counted).scalar_one()
+    
+    @staticmethod
+    def limit_read_time(timeout_ms: int = None):
+        """
+        Cap how long the rest of the transaction's statements may run
+        
+        On PostgreSQL this sets a transaction-local statement_timeout, so
+        a pathological search is cancelled by the server instead of
+        pinning a worker; the setting ends with the request's transaction.
+        Other databases have no equivalent and are left alone.
+        
+        Args:
+            timeout_ms: Timeout in milliseconds (default:
+                READ_STATEMENT_TIMEOUT_MS); 0 disables it
+        """
+        if timeout_ms is None:
+            timeout_ms = config.read_statement_timeout_ms
+        if not timeout_ms or db.session.get_bind().dialect.name != 'postgresql':
+            return
+        
+        # set_config() takes bind parameters, unlike SET LOCAL
+        db.session.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {'timeout': str(int(timeout_ms))}
+        )
+    
+    @staticmethod
+    def resolve_include_total(include_total: bool = None) -> bool:
+        """
+        Decide whether an offset listing counts its total
+        
+        Args:
+            include_total: Caller's choice, or None for the configured default
+            
+        Returns:
+            True if the total should be counted
+        """
+        if include_total is None:
+            return config.pagination_count_total
+        return include_total
+    
+    @staticmethod
+    def build_offset_response(rows: List, page: int, per_page: int,
+                              item_key: str, total: int = None) -> Dict:
+        """
+        Build an offset pagination response
+        
+        The query fetches per_page + 1 rows so has_next is known even when
+        the total isn't counted; total and pages are only included when
+        it was.
+        
+        Args:
+            rows: Up to per_page + 1 rows starting at the page's offset
+            page: Current page number
+            per_page: Items per page
+            item_key: Key name for items in response
+            total: Number of matching rows, or None if not counted
+            
+        Returns:
+            Dictionary with items and pagination metadata
+        """
+        result = {
+            item_key: rows[:per_page],
+            'page': page,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page,
+            'has_prev': page > 1
+        }
+        if total is not None:
+            result['total'] = total
+            result['pages'] = ceil(total / per_page)
+        return result
     
     @staticmethod
     def build_pagination_response(paginated, page: int, per_page: int, 
@@ -94,4 +264,36 @@ class BaseService:
             'pages': paginated.pages,
             'has_next': paginated.has_next,
             'has_prev': paginated.has_prev
+        }
+    
+    @staticmethod
+    def build_keyset_response(rows: List, per_page: int, item_key: str,
+                              sort_key: Callable) -> Dict:
+        """
+        Build a keyset (cursor) pagination response
+        
+        The query fetches per_page + 1 rows; the extra row only signals
+        that another page exists and is not returned.
+        
+        Args:
+            rows: Up to per_page + 1 rows in listing order
+            per_page: Items per page
+            item_key: Key name for items in response
+            sort_key: Returns a row's JSON-serializable sort key values
+            
+        Returns:
+            Dictionary with items and the cursor for the next page
+        """
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        
+        next_cursor = None
+        if has_next:
+            next_cursor = urlsafe_b64encode(orjson.dumps(sort_key(rows[-1]))).decode()
+        
+        return {
+            item_key: rows,
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': has_next
         }
\ No newline at end of file
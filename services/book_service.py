@@ -8,12 +8,15 @@ Demonstrates:
 - Transaction management
 """
 
-from typing import Dict
-from sqlalchemy import or_
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from datetime import datetime
+from typing import Dict, Iterator, List
+from sqlalchemy import delete, exists, func, insert, or_, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager, joinedload, load_only, selectinload
 
+from config import config
 from database import db
-from models import Book, Author, Category
+from models import Book, Author, Category, book_categories
 from validators import BookValidator, PaginationValidator
 from exceptions import (
     BookNotFoundError,
@@ -22,7 +25,11 @@ from exceptions import (
     DatabaseError,
     ValidationError
 )
-from .base_service import BaseService
+from .base_service import BaseService, ConstraintViolation
+
+# Constraint violations reported as domain errors
+_ISBN_TAKEN = ConstraintViolation('unique', 'books', 'isbn')
+_AUTHOR_MISSING = ConstraintViolation('foreign_key', 'books', 'author_id')
 
 
 class BookService(BaseService):
@@ -31,10 +38,16 @@ class BookService(BaseService):
     @staticmethod
     def get_all_books(page: int = 1, per_page: int = 10, 
                       search: str = None, category: str = None, 
-                      year: int = None, author_id: int = None) -> Dict:
+                      year: int = None, author_id: int = None,
+                      fields: str = None, cursor: str = None,
+                      include_total: bool = None) -> Dict:
         """
         Get all books with optional filtering, search, and pagination
         
+        Passing cursor switches to keyset pagination: an index seek on
+        (created_at, id) replaces OFFSET, and no COUNT query is issued.
+        Offset pages skip the COUNT too when include_total is False.
+        
         Args:
             page: Page number (1-indexed)
             per_page: Items per page
@@ -42,35 +55,197 @@ class BookService(BaseService):
             category: Filter by category name
             year: Filter by publication year
             author_id: Filter by author ID
+            fields: Comma-separated fields to return (default: all)
+            cursor: next_cursor of the previous page ('' for the first)
+            include_total: Count total/pages (default: PAGINATION_COUNT_TOTAL)
             
         Returns:
             Dictionary with books, pagination info
         """
-        # Validate pagination
+        # Validate pagination and requested fields
         page, per_page = PaginationValidator.validate_pagination(page, per_page)
+        fields = BookValidator.validate_fields(fields)
         
         # Build query using helper method
         query = BookService._build_book_query(search, category, year, author_id)
+        BookService.limit_read_time()
+        
+        # Eager-load everything to_dict() touches to avoid N+1 queries.
+        # Keyset pages select straight from the search's author JOIN, so
+        # they load the author from it; offset pages join back to books
+        joined_author = bool(search) and cursor is not None
+        loader_options = BookService.list_loader_options(
+            *BookService._field_loader_options(fields, per_page, joined_author)
+        )
+        
+        if cursor is not None:
+            after = PaginationValidator.validate_cursor(
+                cursor, datetime.fromisoformat, int
+            )
+            return BookService._get_books_after(
+                query.options(*loader_options), after, per_page, fields
+            )
         
         # Execute paginated query
         try:
-            paginated = query.order_by(Book.created_at.desc()).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
+            total = None
+            if BookService.resolve_include_total(include_total):
+                total = BookService.fast_count(query)
+            
+            books = db.session.scalars(
+                BookService._offset_page_query(query, page, per_page)
+                .options(*loader_options)
+            ).all()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch books: {str(e)}")
+        
+        result = BookService.build_offset_response(books, page, per_page, 'books', total)
+        result['books'] = [book.to_dict(fields=fields) for book in result['books']]
+        return result
+    
+    @staticmethod
+    def _offset_page_query(query, page: int, per_page: int):
+        """
+        Build an OFFSET page query that skips rows using only their IDs
+        
+        The inner query walks the (created_at, id) index to find the IDs
+        on the page, so the rows skipped by OFFSET are never read in
+        full; only the page's own rows are then fetched.
+        
+        Args:
+            query: Filtered book query
+            page: Page number (1-indexed)
+            per_page: Items per page
             
-            return {
-                'books': [book.to_dict() for book in paginated.items],
-                'total': paginated.total,
-                'page': page,
-                'per_page': per_page,
-                'pages': paginated.pages,
-                'has_next': paginated.has_next,
-                'has_prev': paginated.has_prev
-            }
+        Returns:
+            Select for up to per_page + 1 books, newest first
+        """
+        page_ids = (
+            query.with_only_columns(Book.id, maintain_column_froms=True)
+            .order_by(Book.created_at.desc(), Book.id.desc())
+            .limit(per_page + 1)
+            .offset((page - 1) * per_page)
+            .subquery()
+        )
+        return (
+            select(Book)
+            .join(page_ids, Book.id == page_ids.c.id)
+            .order_by(Book.created_at.desc(), Book.id.desc())
+        )
+    
+    @staticmethod
+    def _get_books_after(query, after: tuple, per_page: int,
+                         fields: frozenset = None) -> Dict:
+        """
+        Fetch the page of books following a keyset cursor
+        
+        Books come newest first, like the offset listing; the row value
+        comparison lets the (created_at, id) index seek straight to the
+        page instead of scanning past every earlier row.
+        
+        Args:
+            query: Filtered book query
+            after: (created_at, id) of the last book already returned,
+                or None for the first page
+            per_page: Items per page
+            fields: Requested field names, or None for every field
+            
+        Returns:
+            Dictionary with books and the cursor for the next page
+        """
+        if after is not None:
+            query = query.where(tuple_(Book.created_at, Book.id) < after)
+        
+        try:
+            books = db.session.scalars(
+                query.order_by(Book.created_at.desc(), Book.id.desc())
+                .limit(per_page + 1)
+            ).all()
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch books: {str(e)}")
+        
+        result = BookService.build_keyset_response(
+            books, per_page, 'books',
+            lambda book: [book.created_at.isoformat(), book.id]
+        )
+        result['books'] = [book.to_dict(fields=fields) for book in result['books']]
+        return result
+    
+    @staticmethod
+    def _field_loader_options(fields: frozenset = None, per_page: int = None,
+                              joined_author: bool = False) -> list:
+        """
+        Build loader options that fetch only what the fieldset serializes
+        
+        Authors are JOINed into small pages (no extra round trip) but
+        loaded with a separate IN query for pages larger than
+        JOINED_AUTHOR_MAX_PER_PAGE, where repeating each author's columns
+        on every one of their books' rows costs more than the round trip.
+        Categories are always IN-loaded; joining a collection would
+        multiply the rows.
+        
+        When the query already joins Book.author (the search filter does),
+        the author is read from that JOIN rather than a second one.
+        
+        Args:
+            fields: Requested field names, or None for every field
+            per_page: Page size, or None for a single book
+            joined_author: Whether the query already joins Book.author
+            
+        Returns:
+            List of loader options
+        """
+        if joined_author:
+            author_loader = contains_eager(Book.author)
+        elif per_page is not None and per_page > config.joined_author_max_per_page:
+            author_loader = selectinload(Book.author)
+        else:
+            author_loader = joinedload(Book.author)
+        
+        if fields is None:
+            return [author_loader, selectinload(Book.categories)]
+        
+        columns = [getattr(Book, name) for name in Book.SERIALIZED_COLUMNS
+                   if name in fields]
+        # created_at is always loaded: keyset cursors are built from it
+        options = [load_only(Book.id, Book.author_id, Book.created_at, *columns)]
+        if 'author' in fields:
+            options.append(author_loader)
+        if 'categories' in fields:
+            options.append(selectinload(Book.categories))
+        return options
+    
+    @staticmethod
+    def iter_books(search: str = None, category: str = None,
+                   year: int = None, author_id: int = None,
+                   batch_size: int = 200) -> Iterator[Dict]:
+        """
+        Iterate over every matching book without loading them all at once
+        
+        Rows are fetched from the database in batches of batch_size, so
+        memory use stays bounded no matter how many books match.
+        
+        Args:
+            search: Search term for title/author
+            category: Filter by category name
+            year: Filter by publication year
+            author_id: Filter by author ID
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Book dictionaries
+        """
+        query = BookService._build_book_query(search, category, year, author_id)
+        query = query.options(*BookService.list_loader_options(
+            *BookService._field_loader_options(joined_author=bool(search))
+        ))
+        
+        books = db.session.scalars(
+            query.order_by(Book.id),
+            execution_options={'yield_per': batch_size}
+        )
+        for book in books:
+            yield book.to_dict()
     
     @staticmethod
     def _build_book_query(search: str = None, category: str = None,
@@ -85,33 +260,34 @@ class BookService(BaseService):
             author_id: Filter by author ID
             
         Returns:
-            SQLAlchemy query object
+            SQLAlchemy select statement
         """
-        query = Book.query
+        query = select(Book)
         
         # Apply search filter (searches in both title and author name)
         if search:
             search_term = f"%{search}%"
-            query = query.join(Author).filter(
+            query = query.join(Book.author).where(
                 or_(
                     Book.title.ilike(search_term),
                     Author.name.ilike(search_term)
                 )
             )
         
-        # Apply category filter
+        # Apply category filter as an EXISTS: joining the categories would
+        # repeat a book once per matching category and need a DISTINCT
         if category:
-            query = query.join(Book.categories).filter(
-                Category.name.ilike(f"%{category}%")
+            query = query.where(
+                Book.categories.any(Category.name.ilike(f"%{category}%"))
             )
         
         # Apply year filter
         if year:
-            query = query.filter(Book.year == year)
+            query = query.where(Book.year == year)
         
         # Apply author filter
         if author_id:
-            query = query.filter(Book.author_id == author_id)
+            query = query.where(Book.author_id == author_id)
         
         return query
     
@@ -120,6 +296,9 @@ class BookService(BaseService):
         """
         Get a specific book by ID
         
+        The author and categories are loaded with the book, since callers
+        serialize or delete them.
+        
         Args:
             book_id: Book ID
             
@@ -129,7 +308,9 @@ class BookService(BaseService):
         Raises:
             BookNotFoundError: If book doesn't exist
         """
-        book = db.session.get(Book, book_id)
+        book = db.session.get(
+            Book, book_id, options=BookService._field_loader_options()
+        )
         if not book:
             raise BookNotFoundError(book_id)
         return book
@@ -153,89 +334,245 @@ class BookService(BaseService):
         # Validate data
         BookValidator.validate_book_data(data)
         
-        # Verify author exists
-        BookService._verify_author_exists(data['author_id'])
-        
-        # Check for duplicate ISBN
-        BookService._check_duplicate_isbn(data['isbn'])
+        # Verify categories exist; the INSERT itself rejects a taken ISBN
+        # (unique constraint) or a missing author (foreign key), which is
+        # also race-free, unlike checking first
+        category_ids = data.get('category_ids') or []
+        BookService._check_book_references(data)
         
-        try:
+        with BookService.transaction("Failed to create book", {
+            _ISBN_TAKEN: DuplicateISBNError(data['isbn']),
+            _AUTHOR_MISSING: AuthorNotFoundError(data['author_id'])
+        }):
             # Create book object
             book = BookService._create_book_object(data)
+            db.session.add(book)
             
-            # Add categories if provided
-            if 'category_ids' in data and data['category_ids']:
-                BookService._add_categories_to_book(book, data['category_ids'])
+            # Link categories once the book has an ID
+            if category_ids:
+                db.session.flush()
+                BookService._link_categories(book.id, category_ids)
+        
+        return book
+    
+    @staticmethod
+    def create_books_bulk(items: list) -> List[int]:
+        """
+        Create many books in a single transaction
+        
+        Every book is validated and all lookups are done up front with one
+        query each; the books and their category links are then written
+        with one multi-row INSERT apiece.
+        
+        Args:
+            items: List of book data dictionaries
             
-            db.session.add(book)
-            db.session.commit()
+        Returns:
+            IDs of the created books, in request order
             
-            return book
+        Raises:
+            ValidationError: If any book is invalid
+            AuthorNotFoundError: If any author doesn't exist
+            DuplicateISBNError: If any ISBN is repeated or already exists
+        """
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of books", field="books")
+        if len(items) > BookValidator.MAX_BULK_BOOKS:
+            raise ValidationError(
+                f"A maximum of {BookValidator.MAX_BULK_BOOKS} books can be created at once",
+                field="books"
+            )
+        
+        for index, data in enumerate(items):
+            if not isinstance(data, dict):
+                raise ValidationError(f"Book {index}: expected an object", field="books")
+            try:
+                BookValidator.validate_book_data(data)
+            except ValidationError as e:
+                raise ValidationError(f"Book {index}: {e.message}", field=e.field)
+        
+        BookService._check_bulk_references(items)
+        
+        # A book added since the check above may still take one of the
+        # ISBNs; look up which one after the rollback
+        isbns = [data['isbn'] for data in items]
+        with BookService.transaction("Failed to create books", {
+            _ISBN_TAKEN: lambda: BookService._existing_isbn_error(isbns)
+        }):
+            book_ids = db.session.scalars(
+                insert(Book).returning(Book.id, sort_by_parameter_order=True),
+                [BookService._book_values(data) for data in items]
+            ).all()
             
-        except IntegrityError:
-            db.session.rollback()
-            raise DuplicateISBNError(data['isbn'])
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"Failed to create book: {str(e)}")
+            links = [
+                {'book_id': book_id, 'category_id': category_id}
+                for book_id, data in zip(book_ids, items)
+                for category_id in data.get('category_ids') or []
+            ]
+            if links:
+                db.session.execute(insert(book_categories), links)
+        
+        return book_ids
     
     @staticmethod
-    def _create_book_object(data: dict) -> Book:
-        """Create book object from data"""
-        return Book(
-            title=data['title'].strip(),
-            isbn=data['isbn'],
-            year=int(data['year']),
-            author_id=data['author_id'],
-            description=data.get('description', '').strip() if data.get('description') else None,
-            pages=int(data['pages']) if data.get('pages') else None
+    def _existing_isbn_error(isbns) -> DuplicateISBNError:
+        """
+        Build the error for an ISBN that already belongs to a book
+        
+        Args:
+            isbns: ISBNs to look up
+            
+        Returns:
+            DuplicateISBNError for one taken ISBN, or None if all are free
+        """
+        existing = db.session.scalar(
+            select(Book.isbn).where(Book.isbn.in_(isbns)).limit(1)
         )
+        return DuplicateISBNError(existing) if existing else None
+    
+    @staticmethod
+    def _check_bulk_references(items: list):
+        """
+        Check ISBNs, authors and categories for a bulk insert
+        
+        Args:
+            items: List of validated book data dictionaries
+            
+        Raises:
+            ValidationError: If any category IDs don't exist
+            AuthorNotFoundError: If any author doesn't exist
+            DuplicateISBNError: If any ISBN is repeated or already exists
+        """
+        isbns = set()
+        for data in items:
+            if data['isbn'] in isbns:
+                raise DuplicateISBNError(data['isbn'])
+            isbns.add(data['isbn'])
+        
+        duplicate = BookService._existing_isbn_error(isbns)
+        if duplicate:
+            raise duplicate
+        
+        author_ids = {data['author_id'] for data in items}
+        found_authors = set(db.session.scalars(
+            select(Author.id).where(Author.id.in_(author_ids))
+        ))
+        missing_authors = author_ids - found_authors
+        if missing_authors:
+            raise AuthorNotFoundError(min(missing_authors))
+        
+        category_ids = {
+            category_id
+            for data in items
+            for category_id in data.get('category_ids') or []
+        }
+        BookService._verify_categories_exist(category_ids)
+    
+    @staticmethod
+    def _book_values(data: dict) -> dict:
+        """Build book column values from data"""
+        return {
+            'title': data['title'],
+            'isbn': data['isbn'],
+            'year': int(data['year']),
+            'author_id': data['author_id'],
+            'description': data.get('description'),
+            'pages': int(data['pages']) if data.get('pages') else None
+        }
     
     @staticmethod
-    def _verify_author_exists(author_id: int):
-        """Verify that author exists"""
-        author = db.session.get(Author, author_id)
-        if not author:
-            raise AuthorNotFoundError(author_id)
+    def _create_book_object(data: dict) -> Book:
+        """Create book object from data"""
+        return Book(**BookService._book_values(data))
     
     @staticmethod
-    def _check_duplicate_isbn(isbn: str, exclude_book_id: int = None):
-        """Check for duplicate ISBN"""
-        query = Book.query.filter_by(isbn=isbn)
-        if exclude_book_id:
-            query = query.filter(Book.id != exclude_book_id)
-        
-        existing = query.first()
-        if existing:
-            raise DuplicateISBNError(isbn)
+    def _check_book_references(data: dict, book_id: int = None):
+        """
+        Check a book's ISBN and categories in one round trip
+        
+        Each check for a field present in data is a scalar subquery of a
+        single SELECT; the missing category IDs are only looked up when
+        the count comes up short. The author isn't checked here: writing
+        a missing author_id fails its foreign key instead, and a new
+        book's ISBN is left to the unique constraint on INSERT.
+        
+        Args:
+            data: Validated book data dictionary
+            book_id: ID of the book being updated (it must exist, and may
+                keep its own ISBN), or None for a new book
+            
+        Raises:
+            BookNotFoundError: If the book being updated doesn't exist
+            DuplicateISBNError: If an updated ISBN is used by another book
+            ValidationError: If any category IDs don't exist
+        """
+        checks = []
+        if book_id is not None:
+            checks.append(exists().where(Book.id == book_id).label('book_exists'))
+        if 'isbn' in data and book_id is not None:
+            isbn_taken = exists().where(Book.isbn == data['isbn'], Book.id != book_id)
+            checks.append(isbn_taken.label('isbn_taken'))
+        
+        category_ids = set(data.get('category_ids') or [])
+        if category_ids:
+            checks.append(
+                select(func.count(Category.id))
+                .where(Category.id.in_(category_ids))
+                .scalar_subquery()
+                .label('categories_found')
+            )
+        
+        if not checks:
+            return
+        
+        row = db.session.execute(select(*checks)).one()._mapping
+        
+        if 'book_exists' in row and not row['book_exists']:
+            raise BookNotFoundError(book_id)
+        if 'isbn_taken' in row and row['isbn_taken']:
+            raise DuplicateISBNError(data['isbn'])
+        if 'categories_found' in row and row['categories_found'] != len(category_ids):
+            BookService._verify_categories_exist(category_ids)
     
     @staticmethod
-    def _add_categories_to_book(book: Book, category_ids: list):
+    def _verify_categories_exist(category_ids):
         """
-        Add categories to book, validating that all IDs exist
+        Verify that every category ID exists, with one IN query
         
         Args:
-            book: Book object
-            category_ids: List of category IDs
+            category_ids: Collection of category IDs
             
         Raises:
             ValidationError: If any category IDs don't exist
         """
-        # Fetch all requested categories
-        categories = Category.query.filter(Category.id.in_(category_ids)).all()
+        if not category_ids:
+            return
         
-        # Check if all requested categories were found
-        found_ids = {cat.id for cat in categories}
         requested_ids = set(category_ids)
+        found_ids = set(db.session.scalars(
+            select(Category.id).where(Category.id.in_(requested_ids))
+        ))
         missing_ids = requested_ids - found_ids
         
         if missing_ids:
             raise ValidationError(
-                f"Category IDs not found: {', '.join(map(str, missing_ids))}",
+                f"Category IDs not found: {', '.join(map(str, sorted(missing_ids)))}",
                 field="category_ids"
             )
+    
+    @staticmethod
+    def _link_categories(book_id: int, category_ids: list):
+        """
+        Insert a book's category links in a single executemany INSERT
         
-        book.categories.extend(categories)
+        Args:
+            book_id: Book ID
+            category_ids: List of verified category IDs
+        """
+        db.session.execute(insert(book_categories), [
+            {'book_id': book_id, 'category_id': category_id}
+            for category_id in category_ids
+        ])
     
     @staticmethod
     def update_book(book_id: int, data: dict) -> Book:
@@ -252,53 +589,54 @@ class BookService(BaseService):
         # Validate data
         BookValidator.validate_book_data(data, is_update=True)
         
-        # Get the book
-        book = BookService.get_book_by_id(book_id)
+        # Verify the book and categories exist and the ISBN is free; a
+        # new author is checked by its foreign key
+        BookService._check_book_references(data, book_id=book_id)
         
-        try:
-            # Update basic fields
-            BookService._update_book_fields(book, data)
+        constraint_errors = {}
+        if 'isbn' in data:
+            constraint_errors[_ISBN_TAKEN] = DuplicateISBNError(data['isbn'])
+        if 'author_id' in data:
+            constraint_errors[_AUTHOR_MISSING] = AuthorNotFoundError(data['author_id'])
+        with BookService.transaction("Failed to update book", constraint_errors):
+            # Write only the submitted columns, without loading the book first
+            changes = BookService._book_changes(data)
+            if changes:
+                db.session.execute(
+                    update(Book).where(Book.id == book_id).values(**changes),
+                    execution_options={'synchronize_session': False}
+                )
             
-            # Update categories if provided
+            # Replace categories if provided: one DELETE and one INSERT for
+            # the links instead of a statement per added or removed category
             if 'category_ids' in data:
-                # Remove existing categories by setting to empty list
-                book.categories = []
-                if data['category_ids']:
-                    BookService._add_categories_to_book(book, data['category_ids'])
-            
-            db.session.commit()
-            return book
-            
-        except IntegrityError:
-            db.session.rollback()
-            raise DuplicateISBNError(data.get('isbn', book.isbn))
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"Failed to update book: {str(e)}")
+                category_ids = data['category_ids'] or []
+                db.session.execute(
+                    delete(book_categories).where(book_categories.c.book_id == book_id)
+                )
+                if category_ids:
+                    BookService._link_categories(book_id, category_ids)
+        
+        # The commit expired the book; reload it with the relations that
+        # get serialized
+        return BookService.get_book_by_id(book_id)
     
     @staticmethod
-    def _update_book_fields(book: Book, data: dict):
-        """Update individual book fields from data"""
-        if 'title' in data:
-            book.title = data['title'].strip()
-        
-        if 'isbn' in data:
-            if data['isbn'] != book.isbn:
-                BookService._check_duplicate_isbn(data['isbn'], exclude_book_id=book.id)
-            book.isbn = data['isbn']
+    def _book_changes(data: dict) -> dict:
+        """Collect the book columns to update from data"""
+        changes = {
+            field: data[field]
+            for field in ('title', 'isbn', 'description', 'author_id')
+            if field in data
+        }
         
         if 'year' in data:
-            book.year = int(data['year'])
-        
-        if 'description' in data:
-            book.description = data['description'].strip() if data['description'] else None
+            changes['year'] = int(data['year'])
         
         if 'pages' in data:
-            book.pages = int(data['pages']) if data['pages'] else None
+            changes['pages'] = int(data['pages']) if data['pages'] else None
         
-        if 'author_id' in data:
-            BookService._verify_author_exists(data['author_id'])
-            book.author_id = data['author_id']
+        return changes
     
     @staticmethod
     def delete_book(book_id: int) -> Book:
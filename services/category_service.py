@@ -6,7 +6,9 @@ and error handling.
 """
 
 from typing import List
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 
 from database import db
 from models import Category
@@ -16,7 +18,12 @@ from exceptions import (
     DuplicateCategoryError,
     DatabaseError
 )
-from .base_service import BaseService
+from .base_service import BaseService, ConstraintViolation
+
+# Constraint violations reported as domain errors; an exact duplicate may
+# fail the unique index on name before the one on name_lower
+_NAME_TAKEN = ConstraintViolation('unique', 'categories', 'name')
+_NAME_TAKEN_IGNORING_CASE = ConstraintViolation('unique', 'categories', 'name_lower')
 
 
 class CategoryService(BaseService):
@@ -31,17 +38,19 @@ class CategoryService(BaseService):
             List of all categories, ordered by name
         """
         try:
-            return Category.query.order_by(Category.name).all()
+            query = select(Category).options(*CategoryService.list_loader_options())
+            return db.session.scalars(query.order_by(Category.name)).all()
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch categories: {str(e)}")
     
     @staticmethod
-    def get_category_by_id(category_id: int) -> Category:
+    def get_category_by_id(category_id: int, include_books: bool = False) -> Category:
         """
         Get a specific category by ID
         
         Args:
             category_id: Category ID
+            include_books: Whether to load books (for display purposes)
             
         Returns:
             Category object
@@ -49,7 +58,10 @@ class CategoryService(BaseService):
         Raises:
             CategoryNotFoundError: If category doesn't exist
         """
-        category = db.session.get(Category, category_id)
+        # Books are only fetched when the response will serialize them
+        options = [selectinload(Category.books)] if include_books else []
+        
+        category = db.session.get(Category, category_id, options=options)
         if not category:
             raise CategoryNotFoundError(category_id)
         return category
@@ -72,40 +84,26 @@ class CategoryService(BaseService):
         # Validate data
         CategoryValidator.validate_category_data(data)
         
-        # Check for duplicate name
-        CategoryService._check_duplicate_name(data['name'])
-        
-        try:
+        # Duplicate names (in any letter case) are rejected by the unique
+        # index on name_lower, so no lookup is needed beforehand
+        with CategoryService.transaction("Failed to create category", {
+            _NAME_TAKEN: DuplicateCategoryError(data['name']),
+            _NAME_TAKEN_IGNORING_CASE: DuplicateCategoryError(data['name'])
+        }):
             # Create category object
             category = CategoryService._create_category_object(data)
-            
             db.session.add(category)
-            db.session.commit()
-            
-            return category
-            
-        except IntegrityError:
-            db.session.rollback()
-            raise DuplicateCategoryError(data['name'])
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise DatabaseError(f"Failed to create category: {str(e)}")
+        
+        return category
     
     @staticmethod
     def _create_category_object(data: dict) -> Category:
         """Create category object from data"""
         return Category(
-            name=data['name'].strip(),
-            description=data.get('description', '').strip() if data.get('description') else None
+            name=data['name'],
+            description=data.get('description')
         )
     
-    @staticmethod
-    def _check_duplicate_name(name: str):
-        """Check if category name already exists"""
-        existing = Category.query.filter_by(name=name.strip()).first()
-        if existing:
-            raise DuplicateCategoryError(name)
-    
     @staticmethod
     def delete_category(category_id: int) -> Category:
         """
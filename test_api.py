@@ -9,30 +9,65 @@ Demonstrates:
 - Relationships
 """
 
+import os
+import threading
 import requests
-import json
-from time import sleep
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
-BASE_URL = "http://localhost:5001
-"
+BASE_URL = "http://localhost:5001"
+
+# VERBOSE=0 prints one status line per call instead of every body
+VERBOSE = os.environ.get('VERBOSE', '1') != '0'
 
 def print_response(response, title):
     """Pretty print API response"""
+    if not VERBOSE:
+        print(f"{response.status_code}  {title}  ({len(response.content)} bytes)")
+        return
+    
     print(f"\n{'='*70}")
     print(f"{title}")
     print(f"{'='*70}")
     print(f"Status: {response.status_code}")
     try:
-        print(f"Response:\n{json.dumps(response.json(), indent=2)}")
+        body = orjson.dumps(orjson.loads(response.content), option=orjson.OPT_INDENT_2)
+        print(f"Response:\n{body.decode()}")
     except:
         print(f"Response: {response.text}")
     print(f"{'='*70}\n")
-    sleep(0.3)
+
+
+def print_responses(requests_by_title):
+    """
+    Fetch independent GET endpoints concurrently, then print them in order
+    
+    A requests.Session isn't safe to share between threads, so each worker
+    thread keeps its own (and its own pooled connection).
+    
+    Args:
+        requests_by_title: List of (path, title) pairs
+    """
+    local = threading.local()
+    
+    def fetch(item):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session.get(f"{BASE_URL}{item[0]}")
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = executor.map(fetch, requests_by_title)
+        for response, (_, title) in zip(responses, requests_by_title):
+            print_response(response, title)
 
 
 def test_api():
     """Run comprehensive API tests"""
     
+    # Reuse one keep-alive connection for every request; json= bodies
+    # set their own Content-Type
+    session = requests.Session()
+    
     print("\n" + "="*70)
     print("WEEK 3 - DATABASE API TESTING")
     print("="*70)
@@ -42,22 +77,20 @@ def test_api():
     
     # Create categories
     print("\n📝 Creating categories...")
-    programming = requests.post(
+    programming = session.post(
         f"{BASE_URL}/categories",
-        json={"name": "Programming", "description": "Software development books"},
-        headers={"Content-Type": "application/json"}
+        json={"name": "Programming", "description": "Software development books"}
     )
     print_response(programming, "POST /categories (Programming)")
     
-    fiction = requests.post(
+    fiction = session.post(
         f"{BASE_URL}/categories",
-        json={"name": "Fiction", "description": "Literary fiction"},
-        headers={"Content-Type": "application/json"}
+        json={"name": "Fiction", "description": "Literary fiction"}
     )
     print_response(fiction, "POST /categories (Fiction)")
     
     # Get all categories
-    categories = requests.get(f"{BASE_URL}/categories")
+    categories = session.get(f"{BASE_URL}/categories")
     print_response(categories, "GET /categories")
     
     # ==================== AUTHOR TESTS ====================
@@ -65,32 +98,30 @@ def test_api():
     
     # Create authors
     print("\n📝 Creating authors...")
-    author1 = requests.post(
+    author1 = session.post(
         f"{BASE_URL}/authors",
         json={
             "name": "Robert C. Martin",
             "bio": "Software engineer and author",
             "country": "USA"
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(author1, "POST /authors (Robert C. Martin)")
     author1_id = author1.json()['data']['id']
     
-    author2 = requests.post(
+    author2 = session.post(
         f"{BASE_URL}/authors",
         json={
             "name": "George Orwell",
             "bio": "English novelist and essayist",
             "country": "UK"
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(author2, "POST /authors (George Orwell)")
     author2_id = author2.json()['data']['id']
     
     # Get all authors (paginated)
-    authors = requests.get(f"{BASE_URL}/authors?page=1&per_page=10")
+    authors = session.get(f"{BASE_URL}/authors?page=1&per_page=10")
     print_response(authors, "GET /authors (paginated)")
     
     # ==================== BOOK TESTS ====================
@@ -101,7 +132,7 @@ def test_api():
     programming_cat_id = programming.json()['data']['id']
     fiction_cat_id = fiction.json()['data']['id']
     
-    book1 = requests.post(
+    book1 = session.post(
         f"{BASE_URL}/books",
         json={
             "title": "Clean Code",
@@ -111,13 +142,12 @@ def test_api():
             "description": "A handbook of agile software craftsmanship",
             "pages": 464,
             "category_ids": [programming_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(book1, "POST /books (Clean Code)")
     book1_id = book1.json()['data']['id']
     
-    book2 = requests.post(
+    book2 = session.post(
         f"{BASE_URL}/books",
         json={
             "title": "Clean Architecture",
@@ -127,12 +157,11 @@ def test_api():
             "description": "A guide to software architecture",
             "pages": 432,
             "category_ids": [programming_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(book2, "POST /books (Clean Architecture)")
     
-    book3 = requests.post(
+    book3 = session.post(
         f"{BASE_URL}/books",
         json={
             "title": "1984",
@@ -142,90 +171,70 @@ def test_api():
             "description": "Dystopian social science fiction",
             "pages": 328,
             "category_ids": [fiction_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(book3, "POST /books (1984)")
     
     # ==================== SEARCH & FILTER TESTS ====================
     print("\n🔍 TESTING SEARCH & FILTERING")
     
-    # Search by title
-    search_title = requests.get(f"{BASE_URL}/books?search=clean")
-    print_response(search_title, "GET /books?search=clean")
-    
-    # Search by author
-    search_author = requests.get(f"{BASE_URL}/books?search=orwell")
-    print_response(search_author, "GET /books?search=orwell")
-    
-    # Filter by category
-    filter_category = requests.get(f"{BASE_URL}/books?category=programming")
-    print_response(filter_category, "GET /books?category=programming")
-    
-    # Filter by year
-    filter_year = requests.get(f"{BASE_URL}/books?year=2008")
-    print_response(filter_year, "GET /books?year=2008")
-    
-    # Filter by author
-    filter_author = requests.get(f"{BASE_URL}/books?author_id=" + str(author1_id))
-    print_response(filter_author, f"GET /books?author_id={author1_id}")
-    
-    # Combined filters
-    combined = requests.get(
-        f"{BASE_URL}/books?category=programming&search=architecture"
-    )
-    print_response(combined, "GET /books?category=programming&search=architecture")
+    # Searches and filters are independent reads, so they run concurrently
+    print_responses([
+        # Search by title
+        ("/books?search=clean", "GET /books?search=clean"),
+        # Search by author
+        ("/books?search=orwell", "GET /books?search=orwell"),
+        # Filter by category
+        ("/books?category=programming", "GET /books?category=programming"),
+        # Filter by year
+        ("/books?year=2008", "GET /books?year=2008"),
+        # Filter by author
+        (f"/books?author_id={author1_id}", f"GET /books?author_id={author1_id}"),
+        # Combined filters
+        ("/books?category=programming&search=architecture",
+         "GET /books?category=programming&search=architecture")
+    ])
     
     # ==================== PAGINATION TESTS ====================
     print("\n📄 TESTING PAGINATION")
     
-    # Get first page
-    page1 = requests.get(f"{BASE_URL}/books?page=1&per_page=2")
-    print_response(page1, "GET /books?page=1&per_page=2")
-    
-    # Get second page
-    page2 = requests.get(f"{BASE_URL}/books?page=2&per_page=2")
-    print_response(page2, "GET /books?page=2&per_page=2")
+    print_responses([
+        ("/books?page=1&per_page=2", "GET /books?page=1&per_page=2"),
+        ("/books?page=2&per_page=2", "GET /books?page=2&per_page=2")
+    ])
     
     # ==================== RELATIONSHIP TESTS ====================
     print("\n🔗 TESTING RELATIONSHIPS")
     
-    # Get author with books
-    author_with_books = requests.get(
-        f"{BASE_URL}/authors/{author1_id}?include_books=true"
-    )
-    print_response(author_with_books, f"GET /authors/{author1_id}?include_books=true")
-    
-    # Get category with books
-    category_with_books = requests.get(
-        f"{BASE_URL}/categories/{programming_cat_id}?include_books=true"
-    )
-    print_response(category_with_books, f"GET /categories/{programming_cat_id}?include_books=true")
-    
-    # Get book with full details
-    book_detail = requests.get(f"{BASE_URL}/books/{book1_id}")
-    print_response(book_detail, f"GET /books/{book1_id}")
+    print_responses([
+        # Get author with books
+        (f"/authors/{author1_id}?include_books=true",
+         f"GET /authors/{author1_id}?include_books=true"),
+        # Get category with books
+        (f"/categories/{programming_cat_id}?include_books=true",
+         f"GET /categories/{programming_cat_id}?include_books=true"),
+        # Get book with full details
+        (f"/books/{book1_id}", f"GET /books/{book1_id}")
+    ])
     
     # ==================== UPDATE TESTS ====================
     print("\n✏️  TESTING UPDATES")
     
     # Update book
-    update_book = requests.put(
+    update_book = session.put(
         f"{BASE_URL}/books/{book1_id}",
         json={
             "year": 2023,
             "description": "Updated description",
             "category_ids": [programming_cat_id, fiction_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(update_book, f"PUT /books/{book1_id}")
     
     # Update author
-    update_author = requests.put(
+    update_author = session.put(
         f"{BASE_URL}/authors/{author1_id}",
-        json={"bio": "Updated biography - Software craftsman and author"},
-        headers={"Content-Type": "application/json"}
+        json={"bio": "Updated biography - Software craftsman and author"}
     )
     print_response(update_author, f"PUT /authors/{author1_id}")
     
@@ -233,7 +242,7 @@ def test_api():
     print("\n❌ TESTING ERROR HANDLING")
     
     # Duplicate ISBN
-    duplicate_isbn = requests.post(
+    duplicate_isbn = session.post(
         f"{BASE_URL}/books",
         json={
             "title": "Another Book",
@@ -241,13 +250,12 @@ def test_api():
             "year": 2020,
             "author_id": author1_id,
             "category_ids": [programming_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(duplicate_isbn, "POST /books (duplicate ISBN)")
     
     # Invalid author
-    invalid_author = requests.post(
+    invalid_author = session.post(
         f"{BASE_URL}/books",
         json={
             "title": "Test Book",
@@ -255,45 +263,41 @@ def test_api():
             "year": 2020,
             "author_id": 9999,  # Non-existent
             "category_ids": [programming_cat_id]
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     print_response(invalid_author, "POST /books (invalid author)")
     
     # Book not found
-    not_found = requests.get(f"{BASE_URL}/books/9999")
+    not_found = session.get(f"{BASE_URL}/books/9999")
     print_response(not_found, "GET /books/9999 (not found)")
     
     # Invalid pagination
-    invalid_page = requests.get(f"{BASE_URL}/books?page=0")
+    invalid_page = session.get(f"{BASE_URL}/books?page=0")
     print_response(invalid_page, "GET /books?page=0 (invalid)")
     
     # ==================== DELETE TESTS ====================
     print("\n🗑️  TESTING DELETES")
     
     # Try to delete author with books (should fail)
-    delete_author_fail = requests.delete(f"{BASE_URL}/authors/{author1_id}")
+    delete_author_fail = session.delete(f"{BASE_URL}/authors/{author1_id}")
     print_response(delete_author_fail, f"DELETE /authors/{author1_id} (has books - should fail)")
     
     # Delete a book
-    delete_book = requests.delete(f"{BASE_URL}/books/{book1_id}")
+    delete_book = session.delete(f"{BASE_URL}/books/{book1_id}")
     print_response(delete_book, f"DELETE /books/{book1_id}")
     
     # Delete category
-    delete_category = requests.delete(f"{BASE_URL}/categories/{fiction_cat_id}")
+    delete_category = session.delete(f"{BASE_URL}/categories/{fiction_cat_id}")
     print_response(delete_category, f"DELETE /categories/{fiction_cat_id}")
     
     # ==================== FINAL STATE ====================
     print("\n📊 FINAL DATABASE STATE")
     
-    all_books = requests.get(f"{BASE_URL}/books")
-    print_response(all_books, "GET /books (final state)")
-    
-    all_authors = requests.get(f"{BASE_URL}/authors")
-    print_response(all_authors, "GET /authors (final state)")
-    
-    all_categories = requests.get(f"{BASE_URL}/categories")
-    print_response(all_categories, "GET /categories (final state)")
+    print_responses([
+        ("/books", "GET /books (final state)"),
+        ("/authors", "GET /authors (final state)"),
+        ("/categories", "GET /categories (final state)")
+    ])
     
     print("\n" + "="*70)
     print("✅ ALL TESTS COMPLETED!")
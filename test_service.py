@@ -3,19 +3,32 @@ Unit tests for Service Layer with Database
 
 This demonstrates proper testing with a real database:
 - Uses a separate test database (SQLite in-memory)
-- Sets up Flask app context for each test
-- Cleans up database between tests
+- Sets up one Flask app context per test class
+- Rolls back each test's transaction, so tests never see each other's data
 - Tests business logic WITHOUT making HTTP requests
 - Fast and focused tests
 """
 
 import unittest
-import os
+import itertools
+from datetime import date
+import sys
 import tempfile
+import pytest
+from unittest import mock
+import dataclasses
+import flask_migrate
+import sqlalchemy
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask_sqlalchemy.session import Session
 from app import create_app
+from cache import cache
+from config import config
 from database import db
 from models import Book, Author, Category
 from services import BookService, AuthorService, CategoryService
+from validators import BookValidator, PaginationValidator
 from exceptions import (
     BookNotFoundError,
     AuthorNotFoundError,
@@ -26,27 +39,89 @@ from exceptions import (
     DatabaseError
 )
 
+# Suffixes for names that must be unique within a database
+_unique_suffixes = itertools.count(1)
+
+
+class TransactionBoundSession(Session):
+    """Session that runs on the connection it was bound to"""
+    
+    def get_bind(self, *args, **kwargs):
+        # Flask-SQLAlchemy always picks the engine, which would check out a
+        # connection outside the test's transaction
+        if self.bind is not None:
+            return self.bind
+        return super().get_bind(*args, **kwargs)
+
 
 class BaseTestCase(unittest.TestCase):
     """Base test case with database setup and teardown"""
     
+    # Transaction control around each test, not queries made by the code
+    TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build one app and schema per test class and enter its context"""
+        # Configure app for testing; the database URI has to be set before
+        # the engine is created. An in-memory SQLite database never touches
+        # the disk, and Flask-SQLAlchemy keeps it on a single connection
+        # for the engine's lifetime, so each test class (and each parallel
+        # worker) gets its own
+        cls.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+            'RAISELOAD': True,
+            'CACHE_TYPE': 'SimpleCache'
+        })
+        
+        # The app context stays pushed for the whole class; tests only
+        # swap out the database session
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        
+        # pysqlite defers BEGIN until the first write and lets RELEASE
+        # of the outermost SAVEPOINT commit; take over transaction
+        # control so a test's commits stay inside its transaction
+        event.listen(db.engine, 'connect', cls._configure_sqlite)
+        event.listen(db.engine, 'begin', cls._emit_begin)
+        db.session.session_factory.class_ = TransactionBoundSession
+        db.create_all()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the class's database and leave its context"""
+        db.engine.dispose()
+        cls.app_context.pop()
+    
+    @staticmethod
+    def _configure_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Test data needs no durability: keep journals and temporary
+        # sort/index storage in memory and never wait on fsync
+        cursor = dbapi_connection.cursor()
+        for pragma in ('journal_mode=MEMORY', 'synchronous=OFF', 'temp_store=MEMORY'):
+            cursor.execute(f'PRAGMA {pragma}')
+        cursor.close()
+    
+    @staticmethod
+    def _emit_begin(connection):
+        connection.exec_driver_sql('BEGIN')
+    
     def setUp(self):
-        """Set up test database before each test"""
-        # Create a temporary file for the test database
-        self.db_fd, self.db_path = tempfile.mkstemp()
-        
-        # Configure app for testing
-        self.app = create_app()
-        self.app.config['TESTING'] = True
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{self.db_path}'
-        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-        
-        # Create application context
-        self.app_context = self.app.app_context()
-        self.app_context.push()
+        """Run each test inside a transaction that is rolled back afterwards"""
+        # Sessions join the test's transaction; their commits and rollbacks
+        # only release or roll back a SAVEPOINT inside it
+        self.connection = db.engine.connect()
+        self.transaction = self.connection.begin()
+        db.session.session_factory.configure(
+            bind=self.connection,
+            join_transaction_mode='create_savepoint'
+        )
         
-        # Create all tables
-        db.create_all()
+        # Forget responses cached and health checks passed by earlier tests
+        cache.clear()
+        self.app.extensions['health_check'].reset()
         
         # Create a test client (for integration tests if needed)
         self.client = self.app.test_client()
@@ -55,38 +130,51 @@ class BaseTestCase(unittest.TestCase):
         """Clean up after each test"""
         # Remove database session
         db.session.remove()
+        db.session.session_factory.configure(bind=None)
         
-        # Drop all tables
-        db.drop_all()
+        # Discard everything the test wrote
+        self.transaction.rollback()
+        self.connection.close()
+    
+    @contextmanager
+    def count_queries(self):
+        """Context manager that records every SQL statement executed"""
+        statements = []
         
-        # Pop application context
-        self.app_context.pop()
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if not statement.startswith(self.TRANSACTION_STATEMENTS):
+                statements.append(statement)
         
-        # Close and remove the temporary database file
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
     
-    def create_test_author(self, name="Test Author", bio="Test bio", country="Test Country"):
+    @classmethod
+    def create_test_author(cls, name="Test Author", bio="Test bio", country="Test Country"):
         """Helper method to create a test author"""
         author = Author(name=name, bio=bio, country=country)
         db.session.add(author)
         db.session.commit()
         return author
     
-    def create_test_category(self, name=None, description="Test description"):
+    @classmethod
+    def create_test_category(cls, name=None, description="Test description"):
         """Helper method to create a test category"""
         if name is None:
-            name = f"Test Category {os.getpid()}"  # Use process ID to ensure uniqueness
+            name = f"Test Category {next(_unique_suffixes)}"
         category = Category(name=name, description=description)
         db.session.add(category)
         db.session.commit()
         return category
     
-    def create_test_book(self, title="Test Book", isbn="1234567890", 
+    @classmethod
+    def create_test_book(cls, title="Test Book", isbn="1234567890", 
                         year=2020, author=None, categories=None):
         """Helper method to create a test book"""
         if author is None:
-            author = self.create_test_author()
+            author = cls.create_test_author()
         
         book = Book(
             title=title,
@@ -103,37 +191,108 @@ class BaseTestCase(unittest.TestCase):
         db.session.add(book)
         db.session.commit()
         return book
+    
+    @classmethod
+    def create_test_authors_bulk(cls, n):
+        """Helper method to create n test authors in one commit"""
+        authors = [Author(name=f"Author {i}") for i in range(n)]
+        db.session.add_all(authors)
+        db.session.commit()
+        return authors
+    
+    @classmethod
+    def create_test_books_bulk(cls, n, author_id):
+        """Helper method to create n test books by one author in one commit"""
+        books = [
+            Book(
+                title=f"Book {i}",
+                isbn=f"123456{i:04d}",
+                year=2020,
+                author_id=author_id,
+                pages=100
+            )
+            for i in range(n)
+        ]
+        db.session.add_all(books)
+        db.session.commit()
+        return books
+    
+    @classmethod
+    def create_test_library(cls):
+        """Create three authors with two books each, all in two categories"""
+        categories = [
+            cls.create_test_category(name="Programming"),
+            cls.create_test_category(name="Fiction")
+        ]
+        for i in range(3):
+            author = cls.create_test_author(name=f"Author {i}")
+            for j in range(2):
+                cls.create_test_book(
+                    title=f"Book {i}-{j}",
+                    isbn=f"97800000000{i}{j}",
+                    author=author,
+                    categories=categories
+                )
+
+
+class SharedDataTestCase(BaseTestCase):
+    """
+    Base for tests that share data built once per class
+    
+    The data is inserted and committed in setUpClass; like any other
+    test's writes, whatever a test changes is rolled back after it.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared data"""
+        super().setUpClass()
+        cls.populate()
+        db.session.remove()
+    
+    @classmethod
+    def populate(cls):
+        """Insert the data the class's tests read"""
 
 
-class TestBookService(BaseTestCase):
+class TestBookService(SharedDataTestCase):
     """Test suite for BookService"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        super().setUp()
-        
-        # Create test author and category
-        self.author = self.create_test_author(
+    @classmethod
+    def populate(cls):
+        """Create the test author and category every test starts from"""
+        cls.author_id = cls.create_test_author(
             name="Robert C. Martin",
             bio="Software engineer",
             country="USA"
-        )
-        self.category = self.create_test_category(
+        ).id
+        cls.category_id = cls.create_test_category(
             name="Programming",
             description="Software development books"
-        )
+        ).id
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        super().setUp()
         
         # Sample valid book data
         self.valid_book_data = {
             'title': 'Clean Code',
             'isbn': '9780132350884',
             'year': 2008,
-            'author_id': self.author.id,
+            'author_id': self.author_id,
             'description': 'A handbook of agile software craftsmanship',
             'pages': 464,
-            'category_ids': [self.category.id]
+            'category_ids': [self.category_id]
         }
     
+    def _book_data(self, exclude=(), **overrides):
+        """Valid book data without the excluded fields, with overrides applied"""
+        data = {**self.valid_book_data, **overrides}
+        for field in exclude:
+            del data[field]
+        return data
+    
     # ==================== CREATE TESTS ====================
     
     def test_create_book_success(self):
@@ -143,84 +302,35 @@ class TestBookService(BaseTestCase):
         self.assertEqual(book.title, 'Clean Code')
         self.assertEqual(book.isbn, '9780132350884')
         self.assertEqual(book.year, 2008)
-        self.assertEqual(book.author_id, self.author.id)
+        self.assertEqual(book.author_id, self.author_id)
         self.assertEqual(book.description, 'A handbook of agile software craftsmanship')
         self.assertEqual(book.pages, 464)
         self.assertIsNotNone(book.created_at)
-        self.assertEqual(len(list(book.categories)), 1)
-        self.assertEqual(list(book.categories)[0].name, 'Programming')
-    
-    def test_create_book_missing_title(self):
-        """Test that creating a book without title raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        del invalid_data['title']
-        
-        with self.assertRaises(ValidationError) as context:
-            BookService.create_book(invalid_data)
-        
-        self.assertIn('title', str(context.exception).lower())
-    
-    def test_create_book_missing_isbn(self):
-        """Test that creating a book without ISBN raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        del invalid_data['isbn']
-        
-        with self.assertRaises(ValidationError) as context:
-            BookService.create_book(invalid_data)
-        
-        self.assertIn('isbn', str(context.exception).lower())
-    
-    def test_create_book_missing_year(self):
-        """Test that creating a book without year raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        del invalid_data['year']
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
-    
-    def test_create_book_missing_author_id(self):
-        """Test that creating a book without author_id raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        del invalid_data['author_id']
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
-    
-    def test_create_book_invalid_year_future(self):
-        """Test that future year raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['year'] = 2050  # Future year
-        
-        with self.assertRaises(ValidationError) as context:
-            BookService.create_book(invalid_data)
-        
-        self.assertIn('year', str(context.exception).lower())
-    
-    def test_create_book_invalid_year_too_old(self):
-        """Test that year before 1000 raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['year'] = 999
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
-    
-    def test_create_book_invalid_isbn_format(self):
-        """Test that invalid ISBN format raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['isbn'] = '123'  # Too short
-        
-        with self.assertRaises(ValidationError) as context:
-            BookService.create_book(invalid_data)
-        
-        self.assertIn('isbn', str(context.exception).lower())
-    
-    def test_create_book_invalid_isbn_non_numeric(self):
-        """Test that non-numeric ISBN raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['isbn'] = 'ABC1234567'
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
+        self.assertEqual(len(book.categories), 1)
+        self.assertEqual(book.categories[0].name, 'Programming')
+    
+    def test_create_book_invalid_data(self):
+        """Each missing or invalid field raises ValidationError"""
+        # (case, book data, text the error must mention or None)
+        cases = [
+            ('missing title', self._book_data(exclude=('title',)), 'title'),
+            ('missing isbn', self._book_data(exclude=('isbn',)), 'isbn'),
+            ('missing year', self._book_data(exclude=('year',)), None),
+            ('missing author_id', self._book_data(exclude=('author_id',)), None),
+            ('future year', self._book_data(year=2050), 'year'),
+            ('year before 1000', self._book_data(year=999), None),
+            ('short isbn', self._book_data(isbn='123'), 'isbn'),
+            ('non-numeric isbn', self._book_data(isbn='ABC1234567'), None),
+            ('negative pages', self._book_data(pages=-10), 'pages'),
+            ('zero pages', self._book_data(pages=0), None),
+            ('blank title', self._book_data(title='   '), None)
+        ]
+        
+        for case, data, mentions in cases:
+            with self.subTest(case):
+                # An empty pattern matches any message
+                with self.assertRaisesRegex(ValidationError, f'(?i){mentions or ""}'):
+                    BookService.create_book(data)
     
     def test_create_book_duplicate_isbn(self):
         """Test that duplicate ISBN raises DuplicateISBNError"""
@@ -228,76 +338,95 @@ class TestBookService(BaseTestCase):
         BookService.create_book(self.valid_book_data)
         
         # Try to create another with same ISBN
-        duplicate_data = self.valid_book_data.copy()
-        duplicate_data['title'] = 'Different Title'
+        duplicate_data = self._book_data(title='Different Title')
         
-        with self.assertRaises(DuplicateISBNError) as context:
+        with self.assertRaisesRegex(DuplicateISBNError, '9780132350884'):
             BookService.create_book(duplicate_data)
-        
-        self.assertIn('9780132350884', str(context.exception))
     
     def test_create_book_invalid_author(self):
         """Test that invalid author_id raises AuthorNotFoundError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['author_id'] = 9999  # Non-existent
+        invalid_data = self._book_data(author_id=9999)  # Non-existent
         
         with self.assertRaises(AuthorNotFoundError):
             BookService.create_book(invalid_data)
     
-    def test_create_book_invalid_pages_negative(self):
-        """Test that negative pages raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['pages'] = -10
-        
-        with self.assertRaises(ValidationError) as context:
-            BookService.create_book(invalid_data)
-        
-        self.assertIn('pages', str(context.exception).lower())
-    
-    def test_create_book_invalid_pages_zero(self):
-        """Test that zero pages raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['pages'] = 0
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
-    
-    def test_create_book_empty_title(self):
-        """Test that empty title raises ValidationError"""
-        invalid_data = self.valid_book_data.copy()
-        invalid_data['title'] = '   '  # Whitespace only
-        
-        with self.assertRaises(ValidationError):
-            BookService.create_book(invalid_data)
+    def test_create_book_other_integrity_error(self):
+        """Only the ISBN unique constraint is reported as a duplicate ISBN"""
+        # Skip validation so the INSERT hits the NOT NULL constraint
+        with mock.patch.object(BookValidator, 'validate_book_data'):
+            with self.assertRaisesRegex(DatabaseError, 'NOT NULL'):
+                BookService.create_book(self._book_data(title=None))
+    
+    def test_create_book_category_foreign_key_failure(self):
+        """A failed category link isn't reported as a missing author"""
+        # Skip the category lookup so the link INSERT hits the foreign key
+        with mock.patch.object(BookService, '_check_book_references'):
+            with self.assertRaises(DatabaseError):
+                BookService.create_book(self._book_data(category_ids=[9999]))
+    
+    def test_create_book_from_new_year(self):
+        """A book from a year that just started is accepted right away"""
+        new_year = date(date.today().year + 1, 1, 1)
+        with mock.patch('validators.book_validator.date') as clock:
+            clock.today.return_value = new_year
+            book = BookService.create_book(self._book_data(year=new_year.year))
+        
+        self.assertEqual(book.year, new_year.year)
     
     def test_create_book_without_categories(self):
         """Test creating a book without categories"""
-        data = self.valid_book_data.copy()
-        del data['category_ids']
+        data = self._book_data(exclude=('category_ids',))
         
         book = BookService.create_book(data)
-        self.assertEqual(len(list(book.categories)), 0)
+        self.assertEqual(len(book.categories), 0)
     
     def test_create_book_multiple_categories(self):
         """Test creating a book with multiple categories"""
         category2 = self.create_test_category(name="Science", description="Science books")
         
-        data = self.valid_book_data.copy()
-        data['category_ids'] = [self.category.id, category2.id]
+        data = self._book_data(category_ids=[self.category_id, category2.id])
         
         book = BookService.create_book(data)
-        self.assertEqual(len(list(book.categories)), 2)
+        self.assertEqual(len(book.categories), 2)
     
-    # ==================== READ TESTS ====================
+    def test_create_books_bulk(self):
+        """Test creating several books in one call"""
+        data2 = self._book_data(isbn='1234567891', title='Another Book')
+        
+        book_ids = BookService.create_books_bulk([self.valid_book_data, data2])
+        
+        self.assertEqual(len(book_ids), 2)
+        self.assertEqual(db.session.get(Book, book_ids[1]).title, 'Another Book')
+        self.assertEqual(db.session.get(Category, self.category_id).book_count, 2)
     
-    def test_get_all_books_empty(self):
-        """Test getting all books when none exist"""
-        result = BookService.get_all_books()
+    def test_create_books_bulk_is_atomic(self):
+        """Test that one invalid book rejects the whole batch"""
+        duplicate = self._book_data(title='Different Title')
         
-        self.assertEqual(len(result['books']), 0)
-        self.assertEqual(result['total'], 0)
-        self.assertEqual(result['page'], 1)
+        with self.assertRaises(DuplicateISBNError):
+            BookService.create_books_bulk([self.valid_book_data, duplicate])
+        
+        self.assertEqual(BookService.get_all_books()['total'], 0)
+    
+    def test_create_books_bulk_rejects_object_body(self):
+        """The bulk endpoint expects an array, single-book routes an object"""
+        response = self.client.post('/books/bulk', json=self.valid_book_data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON array', response.get_json()['error'])
+    
+    def test_create_books_bulk_reports_taken_isbn(self):
+        """An ISBN taken after the up-front check is the one reported"""
+        BookService.create_book(self._book_data(isbn='1234567891'))
+        batch = [self.valid_book_data, self._book_data(isbn='1234567891', title='Taken')]
+        
+        # Skip the up-front check so the INSERT hits the unique constraint
+        with mock.patch.object(BookService, '_check_bulk_references'):
+            with self.assertRaisesRegex(DuplicateISBNError, '1234567891'):
+                BookService.create_books_bulk(batch)
+    
+    # ==================== READ TESTS ====================
     
+
     def test_get_all_books_with_data(self):
         """Test getting all books when some exist"""
         BookService.create_book(self.valid_book_data)
@@ -318,21 +447,10 @@ class TestBookService(BaseTestCase):
         self.assertEqual(retrieved_book.title, created_book.title)
         self.assertEqual(retrieved_book.isbn, created_book.isbn)
     
-    def test_get_book_by_id_not_found(self):
-        """Test that getting non-existent book raises BookNotFoundError"""
-        with self.assertRaises(BookNotFoundError) as context:
-            BookService.get_book_by_id(999)
-        
-        self.assertEqual(context.exception.book_id, 999)
-    
+
     def test_get_all_books_with_pagination(self):
         """Test pagination"""
-        # Create 5 books
-        for i in range(5):
-            data = self.valid_book_data.copy()
-            data['isbn'] = f'123456789{i}'
-            data['title'] = f'Book {i}'
-            BookService.create_book(data)
+        self.create_test_books_bulk(5, self.author_id)
         
         # Get first page (2 per page)
         result = BookService.get_all_books(page=1, per_page=2)
@@ -343,6 +461,62 @@ class TestBookService(BaseTestCase):
         self.assertTrue(result['has_next'])
         self.assertFalse(result['has_prev'])
     
+    def test_get_all_books_offset_pages_match_cursor_order(self):
+        """Offset pages list the same books, in the same order, as cursors"""
+        for i in range(5):
+            data = self._book_data(isbn=f'123456789{i}', title=f'Book {i}')
+            BookService.create_book(data)
+        
+        by_offset = [
+            book['title']
+            for page in (1, 2, 3)
+            for book in BookService.get_all_books(page=page, per_page=2)['books']
+        ]
+        by_cursor = [book['title'] for book in BookService.get_all_books(per_page=5, cursor='')['books']]
+        
+        self.assertEqual(by_offset, by_cursor)
+        self.assertEqual(len(set(by_offset)), 5)
+    
+    def test_get_all_books_without_total(self):
+        """Offset pages can skip the count and still report has_next"""
+        for i in range(3):
+            data = self._book_data(isbn=f'123456789{i}')
+            BookService.create_book(data)
+        
+        first = BookService.get_all_books(per_page=2, include_total=False)
+        self.assertNotIn('total', first)
+        self.assertTrue(first['has_next'])
+        
+        last = BookService.get_all_books(page=2, per_page=2, include_total=False)
+        self.assertEqual(len(last['books']), 1)
+        self.assertFalse(last['has_next'])
+        self.assertTrue(last['has_prev'])
+    
+    def test_get_all_books_with_cursor(self):
+        """Keyset pagination walks every book, newest first, without a count"""
+        for i in range(5):
+            data = self._book_data(isbn=f'123456789{i}', title=f'Book {i}')
+            BookService.create_book(data)
+        
+        first = BookService.get_all_books(per_page=2, cursor='')
+        self.assertNotIn('total', first)
+        self.assertTrue(first['has_next'])
+        
+        second = BookService.get_all_books(per_page=2, cursor=first['next_cursor'])
+        last = BookService.get_all_books(per_page=2, cursor=second['next_cursor'])
+        
+        titles = [book['title'] for page in (first, second, last) for book in page['books']]
+        self.assertEqual(titles, [f'Book {i}' for i in reversed(range(5))])
+        self.assertFalse(last['has_next'])
+        self.assertIsNone(last['next_cursor'])
+    
+    def test_get_all_books_invalid_cursor(self):
+        """A cursor that wasn't issued by the API is rejected"""
+        with self.assertRaises(ValidationError) as context:
+            BookService.get_all_books(cursor='not-a-cursor')
+        
+        self.assertEqual(context.exception.field, 'cursor')
+    
     def test_get_all_books_with_search(self):
         """Test search functionality"""
         # Create books with different titles and authors
@@ -376,7 +550,7 @@ class TestBookService(BaseTestCase):
             'title': 'Another Book',
             'isbn': '1234567891',
             'year': 2020,
-            'author_id': self.author.id,
+            'author_id': self.author_id,
             'category_ids': [fiction.id]
         }
         BookService.create_book(data2)
@@ -385,14 +559,22 @@ class TestBookService(BaseTestCase):
         self.assertEqual(len(result['books']), 1)
         self.assertEqual(result['books'][0]['title'], 'Clean Code')
     
+    def test_get_all_books_filter_by_category_lists_book_once(self):
+        """A book matching the category filter twice is listed once"""
+        science = self.create_test_category(name="Science")
+        fiction = self.create_test_category(name="Science Fiction")
+        data = self._book_data(category_ids=[science.id, fiction.id])
+        BookService.create_book(data)
+        
+        result = BookService.get_all_books(category='science')
+        self.assertEqual(len(result['books']), 1)
+        self.assertEqual(result['total'], 1)
+    
     def test_get_all_books_filter_by_year(self):
         """Test filtering by year"""
         BookService.create_book(self.valid_book_data)
         
-        data2 = self.valid_book_data.copy()
-        data2['isbn'] = '1234567891'
-        data2['title'] = 'Another Book'
-        data2['year'] = 2020
+        data2 = self._book_data(isbn='1234567891', title='Another Book', year=2020)
         BookService.create_book(data2)
         
         result = BookService.get_all_books(year=2008)
@@ -412,10 +594,27 @@ class TestBookService(BaseTestCase):
         }
         BookService.create_book(data2)
         
-        result = BookService.get_all_books(author_id=self.author.id)
+        result = BookService.get_all_books(author_id=self.author_id)
         self.assertEqual(len(result['books']), 1)
         self.assertEqual(result['books'][0]['author']['name'], 'Robert C. Martin')
     
+    def test_get_all_books_sparse_fields(self):
+        """Test limiting the returned fields"""
+        BookService.create_book(self.valid_book_data)
+        db.session.expire_all()
+        
+        result = BookService.get_all_books(fields='title,isbn,author')
+        self.assertEqual(result['books'][0], {
+            'title': 'Clean Code',
+            'isbn': '9780132350884',
+            'author': {'id': self.author_id, 'name': 'Robert C. Martin', 'country': 'USA'}
+        })
+    
+    def test_get_all_books_unknown_field(self):
+        """Test that unknown fields raise ValidationError"""
+        with self.assertRaisesRegex(ValidationError, 'price'):
+            BookService.get_all_books(fields='title,price')
+    
     # ==================== UPDATE TESTS ====================
     
     def test_update_book_title(self):
@@ -452,28 +651,53 @@ class TestBookService(BaseTestCase):
         
         updated_book = BookService.update_book(book.id, update_data)
         
-        self.assertEqual(len(list(updated_book.categories)), 1)
-        self.assertEqual(list(updated_book.categories)[0].name, 'Science')
+        self.assertEqual(len(updated_book.categories), 1)
+        self.assertEqual(updated_book.categories[0].name, 'Science')
     
-    def test_update_book_not_found(self):
-        """Test that updating non-existent book raises BookNotFoundError"""
-        with self.assertRaises(BookNotFoundError):
-            BookService.update_book(999, {'title': 'New Title'})
-    
-    def test_update_book_invalid_year(self):
-        """Test that updating with invalid year raises ValidationError"""
+    def test_update_book_unknown_category_keeps_links(self):
+        """A bad category ID fails the update without touching existing links"""
         book = BookService.create_book(self.valid_book_data)
         
         with self.assertRaises(ValidationError):
-            BookService.update_book(book.id, {'year': 3000})
+            BookService.update_book(book.id, {'category_ids': [self.category_id, 999]})
+        
+        db.session.expire_all()
+        self.assertEqual([c.id for c in book.categories], [self.category_id])
+    
+    def test_update_book_failure_rolls_back(self):
+        """A failed update leaves no partial changes in the session"""
+        book = BookService.create_book(self.valid_book_data)
+        
+        with self.assertRaises(AuthorNotFoundError):
+            BookService.update_book(book.id, {'title': 'Changed', 'author_id': 999})
+        
+        self.assertEqual(book.title, self.valid_book_data['title'])
+        self.assertFalse(db.session.dirty)
+    
+
+    def test_update_book_invalid_data(self):
+        """Each invalid updated field raises ValidationError"""
+        book = BookService.create_book(self.valid_book_data)
+        
+        # (case, changes, text the error must mention)
+        cases = [
+            ('future year', {'year': 3000}, 'year'),
+            ('short isbn', {'isbn': '123'}, 'isbn'),
+            ('negative pages', {'pages': -1}, 'pages'),
+            ('blank title', {'title': '   '}, 'title'),
+            ('repeated category', {'category_ids': [self.category_id] * 2}, 'category')
+        ]
+        
+        for case, changes, mentions in cases:
+            with self.subTest(case):
+                with self.assertRaisesRegex(ValidationError, f'(?i){mentions}'):
+                    BookService.update_book(book.id, changes)
     
     def test_update_book_duplicate_isbn(self):
         """Test that updating to duplicate ISBN raises DuplicateISBNError"""
         book1 = BookService.create_book(self.valid_book_data)
         
-        data2 = self.valid_book_data.copy()
-        data2['isbn'] = '9781234567890'
-        data2['title'] = 'Another Book'
+        data2 = self._book_data(isbn='9781234567890', title='Another Book')
         book2 = BookService.create_book(data2)
         
         # Try to update book2's ISBN to match book1
@@ -497,24 +721,51 @@ class TestBookService(BaseTestCase):
         
         self.assertEqual(deleted_book.id, book.id)
         
-        # Verify it's actually deleted
+        # Verify it's actually deleted, from listings and by ID
         result = BookService.get_all_books()
         self.assertEqual(len(result['books']), 0)
+        
+        with self.assertRaises(BookNotFoundError):
+            BookService.get_book_by_id(book.id)
+
+
+class TestEmptyLibrary(SharedDataTestCase):
+    """Empty-state and not-found branches, sharing one set of empty tables"""
+    
+    def test_get_all_books_empty(self):
+        """Test getting all books when none exist"""
+        result = BookService.get_all_books()
+        
+        self.assertEqual(len(result['books']), 0)
+        self.assertEqual(result['total'], 0)
+        self.assertEqual(result['page'], 1)
+    
+    def test_get_book_by_id_not_found(self):
+        """Test that getting non-existent book raises BookNotFoundError"""
+        with self.assertRaises(BookNotFoundError) as context:
+            BookService.get_book_by_id(999)
+        
+        self.assertEqual(context.exception.book_id, 999)
+    
+    def test_update_book_not_found(self):
+        """Test that updating non-existent book raises BookNotFoundError"""
+        with self.assertRaises(BookNotFoundError):
+            BookService.update_book(999, {'title': 'New Title'})
     
     def test_delete_book_not_found(self):
         """Test that deleting non-existent book raises BookNotFoundError"""
         with self.assertRaises(BookNotFoundError):
             BookService.delete_book(999)
     
-    def test_delete_book_actually_removes(self):
-        """Test that deleted book is actually removed from database"""
-        book = BookService.create_book(self.valid_book_data)
-        book_id = book.id
-        
-        BookService.delete_book(book_id)
-        
-        with self.assertRaises(BookNotFoundError):
-            BookService.get_book_by_id(book_id)
+    def test_get_author_by_id_not_found(self):
+        """Test getting non-existent author raises AuthorNotFoundError"""
+        with self.assertRaises(AuthorNotFoundError):
+            AuthorService.get_author_by_id(999)
+    
+    def test_get_category_by_id_not_found(self):
+        """Test getting non-existent category raises CategoryNotFoundError"""
+        with self.assertRaises(CategoryNotFoundError):
+            CategoryService.get_category_by_id(999)
 
 
 class TestAuthorService(BaseTestCase):
@@ -539,6 +790,13 @@ class TestAuthorService(BaseTestCase):
         self.assertEqual(author.country, 'USA')
         self.assertIsNotNone(author.created_at)
     
+    def test_create_author_strips_text(self):
+        """Text fields are trimmed, and blank ones stored as NULL"""
+        author = AuthorService.create_author({'name': '  Ada Lovelace ', 'bio': '   '})
+        
+        self.assertEqual(author.name, 'Ada Lovelace')
+        self.assertIsNone(author.bio)
+    
     def test_create_author_missing_name(self):
         """Test creating author without name raises ValidationError"""
         invalid_data = {}
@@ -560,6 +818,30 @@ class TestAuthorService(BaseTestCase):
         with self.assertRaises(ValidationError):
             AuthorService.create_author(invalid_data)
     
+    def test_create_author_rejects_bad_request_body(self):
+        """Test that non-JSON and malformed bodies get a 400 response"""
+        response = self.client.post('/authors', data='name=x')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Content-Type', response.get_json()['error'])
+        
+        response = self.client.post('/authors', data='{"name":',
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not valid JSON', response.get_json()['error'])
+        
+        response = self.client.post('/authors', json=[1, 2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON object', response.get_json()['error'])
+    
+    def test_author_timestamps_serialize_like_isoformat(self):
+        """Timestamps are returned as isoformat() writes them, with no offset"""
+        author = AuthorService.create_author(self.valid_author_data)
+        
+        response = self.client.get(f'/authors/{author.id}')
+        
+        self.assertEqual(response.get_json()['data']['created_at'],
+                         author.created_at.isoformat())
+    
     def test_get_author_by_id_success(self):
         """Test getting author by ID"""
         created_author = AuthorService.create_author(self.valid_author_data)
@@ -569,22 +851,31 @@ class TestAuthorService(BaseTestCase):
         self.assertEqual(retrieved_author.id, created_author.id)
         self.assertEqual(retrieved_author.name, created_author.name)
     
-    def test_get_author_by_id_not_found(self):
-        """Test getting non-existent author raises AuthorNotFoundError"""
-        with self.assertRaises(AuthorNotFoundError):
-            AuthorService.get_author_by_id(999)
-    
+
     def test_get_all_authors_with_pagination(self):
         """Test getting all authors with pagination"""
-        for i in range(5):
-            data = {'name': f'Author {i}'}
-            AuthorService.create_author(data)
+        self.create_test_authors_bulk(5)
         
         result = AuthorService.get_all_authors(page=1, per_page=2)
         
         self.assertEqual(len(result['authors']), 2)
         self.assertEqual(result['total'], 5)
     
+    def test_get_all_authors_with_cursor(self):
+        """Keyset pagination orders by name and breaks ties by id"""
+        for name in ['Carol', 'Alice', 'Bob', 'Alice']:
+            AuthorService.create_author({'name': name})
+        
+        seen = []
+        cursor = ''
+        while cursor is not None:
+            result = AuthorService.get_all_authors(per_page=3, cursor=cursor)
+            seen.extend((author['name'], author['id']) for author in result['authors'])
+            cursor = result['next_cursor']
+        
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual([name for name, _ in seen], ['Alice', 'Alice', 'Bob', 'Carol'])
+    
     def test_update_author_success(self):
         """Test updating an author"""
         author = AuthorService.create_author(self.valid_author_data)
@@ -610,10 +901,8 @@ class TestAuthorService(BaseTestCase):
         author = self.create_test_author()
         self.create_test_book(author=author)
         
-        with self.assertRaises(ValidationError) as context:
+        with self.assertRaisesRegex(ValidationError, r'1 book\(s\)'):
             AuthorService.delete_author(author.id)
-        
-        self.assertIn('book', str(context.exception).lower())
 
 
 class TestCategoryService(BaseTestCase):
@@ -624,7 +913,7 @@ class TestCategoryService(BaseTestCase):
         super().setUp()
         
         self.valid_category_data = {
-            'name': f'Programming {os.getpid()}',
+            'name': f'Programming {next(_unique_suffixes)}',
             'description': 'Software development books'
         }
     
@@ -652,6 +941,21 @@ class TestCategoryService(BaseTestCase):
         with self.assertRaises(DuplicateCategoryError):
             CategoryService.create_category(self.valid_category_data)
     
+    def test_create_category_duplicate_name_ignores_case(self):
+        """Category names differing only in case are duplicates"""
+        CategoryService.create_category({'name': 'Science Fiction'})
+        
+        with self.assertRaises(DuplicateCategoryError):
+            CategoryService.create_category({'name': 'science FICTION'})
+    
+    def test_create_category_other_integrity_error(self):
+        """Only the unique name indexes are reported as a duplicate name"""
+        # An unnamed category makes the INSERT hit the NOT NULL constraint
+        with mock.patch.object(CategoryService, '_create_category_object',
+                               return_value=Category(description='No name')):
+            with self.assertRaisesRegex(DatabaseError, 'NOT NULL'):
+                CategoryService.create_category(self.valid_category_data)
+    
     def test_create_category_name_too_long(self):
         """Test creating category with name > 100 chars raises ValidationError"""
         invalid_data = {'name': 'A' * 101}
@@ -668,11 +972,7 @@ class TestCategoryService(BaseTestCase):
         self.assertEqual(retrieved_category.id, created_category.id)
         self.assertEqual(retrieved_category.name, created_category.name)
     
-    def test_get_category_by_id_not_found(self):
-        """Test getting non-existent category raises CategoryNotFoundError"""
-        with self.assertRaises(CategoryNotFoundError):
-            CategoryService.get_category_by_id(999)
-    
+
     def test_get_all_categories(self):
         """Test getting all categories"""
         CategoryService.create_category(self.valid_category_data)
@@ -696,10 +996,8 @@ class TestPaginationValidation(BaseTestCase):
     
     def test_invalid_page_zero(self):
         """Test that page=0 raises ValidationError"""
-        with self.assertRaises(ValidationError) as context:
+        with self.assertRaisesRegex(ValidationError, '(?i)page'):
             BookService.get_all_books(page=0)
-        
-        self.assertIn('page', str(context.exception).lower())
     
     def test_invalid_page_negative(self):
         """Test that negative page raises ValidationError"""
@@ -715,42 +1013,355 @@ class TestPaginationValidation(BaseTestCase):
         """Test that per_page>100 raises ValidationError"""
         with self.assertRaises(ValidationError):
             BookService.get_all_books(per_page=101)
+    
+    def test_invalid_pagination_is_never_cached(self):
+        """Memoized validation still rejects a bad pair on every call"""
+        self.assertEqual(PaginationValidator.validate_pagination(2, 20), (2, 20))
+        self.assertEqual(PaginationValidator.validate_pagination(2, 20), (2, 20))
+        
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                PaginationValidator.validate_pagination(1, 500)
 
 
-def run_tests():
-    """Run all tests and display results"""
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+class TestQueryCounts(SharedDataTestCase):
+    """Guard list endpoints against N+1 query regressions"""
     
-    # Add all test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestBookService))
-    suite.addTests(loader.loadTestsFromTestCase(TestAuthorService))
-    suite.addTests(loader.loadTestsFromTestCase(TestCategoryService))
-    suite.addTests(loader.loadTestsFromTestCase(TestPaginationValidation))
+    @classmethod
+    def populate(cls):
+        """Create several authors, each with books in shared categories"""
+        cls.create_test_library()
+    
+    def test_get_all_books_query_count(self):
+        """Listing books issues a fixed number of queries"""
+        with self.count_queries() as statements:
+            result = BookService.get_all_books()
+        
+        self.assertEqual(len(result['books']), 6)
+        self.assertLessEqual(len(statements), 4)
     
-    # Run tests with verbose output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    def test_get_all_books_large_page_selectin_loads_authors(self):
+        """Large pages load authors with an IN query instead of a JOIN"""
+        with self.count_queries() as statements:
+            result = BookService.get_all_books(per_page=50)
+        
+        self.assertEqual(len(result['books']), 6)
+        self.assertTrue(all(book['author'] for book in result['books']))
+        self.assertTrue(any(sql.startswith('SELECT authors.') for sql in statements))
+        self.assertLessEqual(len(statements), 4)
     
-    # Print summary
-    print("\n" + "="*70)
-    print("TEST SUMMARY")
-    print("="*70)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Successes: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
+    def test_get_all_books_cursor_query_count(self):
+        """Keyset pagination skips the COUNT query"""
+        with self.count_queries() as statements:
+            BookService.get_all_books(cursor='')
+        
+        self.assertFalse(any(sql.lower().startswith('select count(') for sql in statements))
     
-    if result.wasSuccessful():
-        print("\n✅ ALL TESTS PASSED!")
-    else:
-        print("\n❌ SOME TESTS FAILED")
+    def test_get_all_books_search_cursor_reuses_author_join(self):
+        """A searched keyset page loads authors from the search's JOIN"""
+        with self.count_queries() as statements:
+            result = BookService.get_all_books(search='author 1', cursor='')
+        
+        self.assertEqual(len(result['books']), 2)
+        self.assertTrue(all(book['author']['name'] == 'Author 1' for book in result['books']))
+        books_select = next(sql for sql in statements if 'FROM books' in sql)
+        self.assertEqual(books_select.count('JOIN authors'), 1)
+    
+    def test_read_timeout_skipped_on_sqlite(self):
+        """The statement timeout is PostgreSQL-only"""
+        with self.count_queries() as statements:
+            BookService.get_all_books()
+            AuthorService.get_all_authors()
+        
+        self.assertFalse(any('statement_timeout' in sql for sql in statements))
+    
+    def test_get_book_by_id_query_count(self):
+        """A single book and its relations load in two queries"""
+        with self.count_queries() as statements:
+            data = BookService.get_book_by_id(1).to_dict()
+        
+        self.assertEqual(len(data['categories']), 2)
+        self.assertEqual(len(statements), 2)
+    
+    def test_get_all_books_count_query_is_flat(self):
+        """The pagination total is counted without a subquery or ORDER BY"""
+        with self.count_queries() as statements:
+            BookService.get_all_books(search='Book')
+        
+        counts = [sql for sql in statements if sql.lower().startswith('select count(')]
+        self.assertEqual(len(counts), 1)
+        self.assertNotIn('ORDER BY', counts[0])
+        self.assertEqual(counts[0].count('SELECT'), 1)
+    
+    def test_get_all_authors_query_count(self):
+        """Listing authors issues a fixed number of queries"""
+        with self.count_queries() as statements:
+            result = AuthorService.get_all_authors()
+        
+        self.assertEqual(len(result['authors']), 3)
+        self.assertLessEqual(len(statements), 3)
+    
+    def test_get_all_categories_query_count(self):
+        """Listing and serializing categories issues a fixed number of queries"""
+        with self.count_queries() as statements:
+            categories = CategoryService.get_all_categories()
+            data = [category.to_dict() for category in categories]
+        
+        self.assertEqual([c['book_count'] for c in data], [6, 6])
+        self.assertEqual(len(statements), 1)
+    
+    def test_book_author_skips_book_count(self):
+        """Authors loaded with a book don't count their own books"""
+        with self.count_queries() as statements:
+            BookService.get_book_by_id(1).to_dict()
+        
+        self.assertFalse(any('count(books.id)' in sql for sql in statements))
+    
+    def test_get_author_by_id_loads_book_count(self):
+        """The author detail loads its book count with the author"""
+        with self.count_queries() as statements:
+            data = AuthorService.get_author_by_id(1).to_dict()
+        
+        self.assertEqual(data['book_count'], 2)
+        self.assertEqual(len(statements), 1)
+    
+    def test_get_category_with_books_query_count(self):
+        """A category with its books loads in two queries; without, in one"""
+        with self.count_queries() as statements:
+            category = CategoryService.get_category_by_id(1, include_books=True)
+            data = category.to_dict(include_books=True)
+        
+        self.assertEqual(len(data['books']), 6)
+        self.assertEqual(len(statements), 2)
+        
+        db.session.expire_all()
+        with self.count_queries() as statements:
+            CategoryService.get_category_by_id(2).to_dict()
+        
+        self.assertEqual(len(statements), 1)
+    
+    def test_export_books_streams_every_book(self):
+        """Export streams all matching books in batches"""
+        books = list(BookService.iter_books(batch_size=4))
+        self.assertEqual(len(books), 6)
+        
+        response = self.client.get('/books/export?author_id=1')
+        self.assertTrue(response.is_streamed)
+        data = response.get_json()
+        self.assertTrue(data['success'])
+        self.assertEqual([b['title'] for b in data['data']], ["Book 0-0", "Book 0-1"])
+
+
+class TestWriteQueryCounts(BaseTestCase):
+    """Keep writes to a fixed number of statements"""
     
-    print("="*70)
+    def setUp(self):
+        """Create several authors, each with books in shared categories"""
+        super().setUp()
+        self.create_test_library()
+        db.session.expire_all()
+    
+    def test_create_book_query_count(self):
+        """Creating a book checks its references in one SELECT"""
+        data = {
+            'title': 'New Book',
+            'isbn': '9781111111111',
+            'year': 2020,
+            'author_id': 1,
+            'category_ids': [1, 2]
+        }
+        with self.count_queries() as statements:
+            BookService.create_book(data)
+        
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+        # The author is left to the foreign key
+        self.assertNotIn('authors', selects[0])
+        self.assertNotIn('isbn', selects[0])
     
-    return result.wasSuccessful()
+    def test_create_book_without_categories_skips_checks(self):
+        """A book without categories is checked by its INSERT alone"""
+        data = {'title': 'New Book', 'isbn': '9781111111111', 'year': 2020, 'author_id': 1}
+        with self.count_queries() as statements:
+            BookService.create_book(data)
+        
+        self.assertFalse(any(sql.lstrip().upper().startswith('SELECT') for sql in statements))
+    
+    def test_update_author_writes_only_changed_columns(self):
+        """An update sets just the submitted columns"""
+        with self.count_queries() as statements:
+            author = AuthorService.update_author(1, {'bio': 'New bio'})
+        
+        updates = [sql for sql in statements if sql.startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('bio=', updates[0].replace(' ', ''))
+        self.assertNotIn('name=', updates[0].replace(' ', ''))
+        self.assertEqual(author.bio, 'New bio')
+    
+    def test_update_book_query_count(self):
+        """Updating a book checks its references in one SELECT"""
+        data = {'isbn': '9781111111111', 'author_id': 2, 'category_ids': [2]}
+        with self.count_queries() as statements:
+            BookService.update_book(1, data)
+        
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+        # The reference check, then the book with its author and categories
+        self.assertEqual(len(selects), 3)
+    
+    def test_update_book_returns_loaded_book(self):
+        """The updated book serializes without lazy loads"""
+        book = BookService.update_book(1, {'title': 'Renamed'})
+        
+        with self.count_queries() as statements:
+            data = book.to_dict()
+        
+        self.assertEqual(data['title'], 'Renamed')
+        self.assertEqual(len(data['categories']), 2)
+        self.assertEqual(statements, [])
+
+
+class TestListCaching(BaseTestCase):
+    """Test cached list responses"""
+    
+    def test_list_response_has_etag(self):
+        """Repeat requests with a matching If-None-Match get a 304"""
+        response = self.client.get('/books')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+        
+        response = self.client.get('/books', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+    
+    def test_categories_listing_is_cached(self):
+        """The category listing is cached and refreshed after writes"""
+        response = self.client.get('/categories')
+        self.assertIsNotNone(response.headers.get('ETag'))
+        self.assertEqual(response.get_json()['data']['categories'], [])
+        
+        self.client.post('/categories', json={'name': 'Fiction'})
+        
+        response = self.client.get('/categories')
+        self.assertEqual(len(response.get_json()['data']['categories']), 1)
+    
+    def test_home_response_has_etag(self):
+        """The static home payload can be revalidated with a 304"""
+        response = self.client.get('/')
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+        
+        response = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+    
+    def test_health_check_reuses_recent_result(self):
+        """Back-to-back health probes hit the database once"""
+        with self.count_queries() as statements:
+            for _ in range(3):
+                response = self.client.get('/health')
+                self.assertEqual(response.get_json()['status'], 'healthy')
+        
+        self.assertEqual(len(statements), 1)
+    
+    def test_write_invalidates_cached_list(self):
+        """A successful write drops stale cached listings"""
+        response = self.client.get('/authors')
+        self.assertEqual(response.get_json()['data']['total'], 0)
+        
+        response = self.client.post('/authors', json={'name': 'Martin Fowler'})
+        self.assertEqual(response.status_code, 201)
+        
+        response = self.client.get('/authors')
+        self.assertEqual(response.get_json()['data']['total'], 1)
+    
+    def test_write_keeps_unrelated_cached_lists(self):
+        """A write only retires the listings that show what it changed"""
+        self.client.get('/authors')
+        self.client.post('/categories', json={'name': 'Programming'})
+        
+        with self.count_queries() as statements:
+            response = self.client.get('/authors')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(statements, [])
+    
+    def test_book_write_invalidates_cached_author_list(self):
+        """Author listings show book counts, so book writes refresh them"""
+        author = AuthorService.create_author({'name': 'Martin Fowler'})
+        response = self.client.get('/authors')
+        self.assertEqual(response.get_json()['data']['authors'][0]['book_count'], 0)
+        
+        response = self.client.post('/books', json={
+            'title': 'Refactoring', 'isbn': '9780134757599',
+            'year': 2018, 'author_id': author.id
+        })
+        self.assertEqual(response.status_code, 201)
+        
+        response = self.client.get('/authors')
+        self.assertEqual(response.get_json()['data']['authors'][0]['book_count'], 1)
+
+
+class TestMigrations(unittest.TestCase):
+    """Test that the migration scripts build the schema the models expect"""
+    
+    @contextmanager
+    def empty_database_app(self):
+        """App context on an empty temporary database, with no tables created"""
+        with tempfile.TemporaryDirectory() as directory:
+            settings = dataclasses.replace(
+                config,
+                database_url=f'sqlite:///{directory}/migrations.db',
+                auto_create_tables=False
+            )
+            with mock.patch('database.config', settings):
+                app = create_app()
+            with app.app_context():
+                try:
+                    yield app
+                finally:
+                    db.engine.dispose()
+    
+    def test_upgrade_matches_models(self):
+        """Upgrading an empty database leaves nothing for autogenerate"""
+        with self.empty_database_app():
+            try:
+                flask_migrate.upgrade()
+                # Exits when autogenerate finds differences
+                flask_migrate.check()
+            except SystemExit:
+                self.fail('migrations are out of date with the models')
+    
+    def test_downgrade_to_base(self):
+        """Every revision can be rolled back"""
+        with self.empty_database_app():
+            flask_migrate.upgrade()
+            flask_migrate.downgrade(revision='base')
+            self.assertEqual(sqlalchemy.inspect(db.engine).get_table_names(),
+                             ['alembic_version'])
+
+
+def run_tests(args: list = ()):
+    """
+    Run all tests, spread across one pytest-xdist worker per CPU
+    
+    Test classes are the unit of distribution: each class builds its app
+    (and any shared data) once in setUpClass, which would otherwise be
+    repeated on every worker that runs one of its tests.
+    
+    Args:
+        args: Extra pytest arguments, e.g. ['--junitxml=report.xml'] for
+            a CI-readable report
+    
+    Returns:
+        pytest exit code
+    """
+    return pytest.main(['-n', 'auto', '--dist=loadscope', '-q', *args, __file__])
 
 
 if __name__ == '__main__':
-    run_tests()
\ No newline at end of file
+    # Arguments are passed through to pytest:
+    #   python test_service.py --junitxml=report.xml
+    # --watch stands for xdist's --looponfail: after each file change,
+    # rerun only the failing tests until they pass, then everything
+    args = ['--looponfail' if arg == '--watch' else arg for arg in sys.argv[1:]]
+    sys.exit(run_tests(args))
\ No newline at end of file
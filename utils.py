@@ -4,7 +4,80 @@ Utility functions for the API
 Contains helper functions for response formatting and other common tasks.
 """
 
-from flask import jsonify
+from functools import wraps
+
+import orjson
+from flask import Response, request, stream_with_context
+
+
+def encode_json(payload) -> bytes:
+    """
+    Encode payload as JSON bytes with orjson
+    
+    orjson encodes datetimes natively, in the same form as isoformat(),
+    so models can hand over datetime objects without calling it.
+    
+    Args:
+        payload: JSON-serializable object
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(payload)
+
+
+def raw_json_response(body: bytes, status_code=200):
+    """
+    Wrap already-encoded JSON in a response
+    
+    Used with bodies encoded once at import time for static payloads.
+    
+    Args:
+        body: Encoded JSON bytes
+        status_code: HTTP status code (default: 200)
+        
+    Returns:
+        Flask Response with application/json mimetype
+    """
+    return Response(body, status=status_code, mimetype='application/json')
+
+
+def json_response(payload, status_code=200):
+    """
+    Serialize payload to a JSON response with orjson
+    
+    Args:
+        payload: JSON-serializable object
+        status_code: HTTP status code (default: 200)
+        
+    Returns:
+        Flask Response with application/json mimetype
+    """
+    return raw_json_response(encode_json(payload), status_code)
+
+
+def stream_json_response(items):
+    """
+    Stream a success response whose data is a list, one item at a time
+    
+    The body is encoded incrementally, so neither the list nor the full
+    JSON document is ever held in memory.
+    
+    Args:
+        items: Iterable of JSON-serializable objects
+        
+    Returns:
+        Streaming Flask Response with application/json mimetype
+    """
+    def generate():
+        yield b'{"success":true,"data":['
+        for index, item in enumerate(items):
+            if index:
+                yield b','
+            yield encode_json(item)
+        yield b']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 def create_success_response(data=None, message=None, status_code=200):
@@ -17,28 +90,92 @@ def create_success_response(data=None, message=None, status_code=200):
         status_code: HTTP status code (default: 200)
         
     Returns:
-        Tuple of (JSON response, status code)
+        JSON response with the given status code
     """
     response = {'success': True}
     if message:
         response['message'] = message
     if data is not None:
         response['data'] = data
-    return jsonify(response), status_code
+    return json_response(response, status_code)
+
+
+# Everything in an error body before the JSON-encoded message
+_ERROR_PREFIX = b'{"success":false,"error":'
 
 
 def create_error_response(error, status_code=400):
     """
     Create standardized error response
     
+    Only the message varies, so it is encoded on its own and spliced
+    into the fixed envelope.
+    
     Args:
         error: Error message (string or exception)
         status_code: HTTP status code (default: 400)
         
     Returns:
-        Tuple of (JSON response, status code)
+        JSON response with the given status code
     """
-    return jsonify({
-        'success': False,
-        'error': str(error)
-    }), status_code
+    return raw_json_response(
+        _ERROR_PREFIX + orjson.dumps(str(error)) + b'}',
+        status_code
+    )
+
+
+def expects_json(view=None, *, body_type: type = dict):
+    """
+    Decode a JSON request body and pass it to the view as its first argument
+    
+    Requests without a JSON content type, with a malformed body, or whose
+    body isn't of body_type get a 400 error without reaching the view. The
+    body is decoded with orjson straight from the raw bytes, which aren't
+    kept around after decoding.
+    
+    Usage:
+        @expects_json
+        def create_book(data): ...
+        
+        @expects_json(body_type=list)
+        def create_books_bulk(data): ...
+    
+    Args:
+        view: Flask view function taking data as its first argument
+        body_type: Type the decoded body must have (dict or list)
+        
+    Returns:
+        Wrapped view function, or a decorator when called with arguments only
+    """
+    if view is None:
+        return lambda view: expects_json(view, body_type=body_type)
+    
+    wrong_type_body = _WRONG_TYPE_BODIES[body_type]
+    
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not request.is_json:
+            return raw_json_response(_NOT_JSON_BODY, 400)
+        try:
+            data = orjson.loads(request.get_data(cache=False))
+        except orjson.JSONDecodeError:
+            return raw_json_response(_INVALID_JSON_BODY, 400)
+        if not isinstance(data, body_type):
+            return raw_json_response(wrong_type_body, 400)
+        return view(data, *args, **kwargs)
+    
+    return wrapper
+
+
+_NOT_JSON_BODY = encode_json({
+    'success': False,
+    'error': "Content-Type must be application/json"
+})
+_INVALID_JSON_BODY = encode_json({
+    'success': False,
+    'error': "Request body is not valid JSON"
+})
+_WRONG_TYPE_BODIES = {
+    dict: encode_json({'success': False, 'error': "Request body must be a JSON object"}),
+    list: encode_json({'success': False, 'error': "Request body must be a JSON array"})
+}
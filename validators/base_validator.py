@@ -44,9 +44,8 @@ class BaseValidator:
         if value is None:
             return
         
-        value_length = len(value.strip())
-        
-        if min_length is not None and value_length < min_length:
+        # Only the minimum ignores surrounding whitespace
+        if min_length is not None and len(value.strip()) < min_length:
             raise ValidationError(
                 f"{field.capitalize()} must be at least {min_length} character(s) long",
                 field=field
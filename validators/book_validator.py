@@ -4,10 +4,13 @@ Book validator - Validates all book-related data
 Ensures data integrity for book operations.
 """
 
-from datetime import datetime
+from datetime import date
 from exceptions import ValidationError
 from .base_validator import BaseValidator
 
+# Deletes the separators allowed in an ISBN in a single pass
+_ISBN_SEPARATORS = str.maketrans('', '', '- ')
+
 
 class BookValidator(BaseValidator):
     """Validates book data"""
@@ -21,6 +24,14 @@ class BookValidator(BaseValidator):
     MIN_ISBN_LENGTH = 10
     MAX_ISBN_LENGTH = 13
     MAX_CATEGORIES = 10
+    MAX_BULK_BOOKS = 1000
+    REQUIRED_FIELDS = ('title', 'isbn', 'year', 'author_id')
+    
+    # Fields a client may request with ?fields=
+    FIELDS = frozenset({
+        'id', 'title', 'isbn', 'year', 'description', 'pages',
+        'created_at', 'updated_at', 'author_id', 'author', 'categories'
+    })
     
     @classmethod
     def validate_book_data(cls, data: dict, is_update: bool = False) -> None:
@@ -57,9 +68,7 @@ class BookValidator(BaseValidator):
     @classmethod
     def validate_required_fields(cls, data: dict) -> None:
         """Validate required fields for book creation"""
-        required_fields = ['title', 'isbn', 'year', 'author_id']
-        
-        for field in required_fields:
+        for field in cls.REQUIRED_FIELDS:
             cls.validate_required_field(data, field)
     
     @classmethod
@@ -74,7 +83,7 @@ class BookValidator(BaseValidator):
     def validate_isbn(cls, isbn: str) -> None:
         """Validate ISBN format"""
         # Clean ISBN (remove hyphens and spaces)
-        clean_isbn = str(isbn).replace('-', '').replace(' ', '')
+        clean_isbn = str(isbn).translate(_ISBN_SEPARATORS)
         
         # Check if digits only
         if not clean_isbn.isdigit():
@@ -93,7 +102,7 @@ class BookValidator(BaseValidator):
     @classmethod
     def validate_year(cls, year: int) -> None:
         """Validate publication year"""
-        current_year = datetime.now().year
+        current_year = date.today().year
         cls.validate_integer_range(year, 'year', 
                                    min_value=cls.MIN_YEAR, 
                                    max_value=current_year)
@@ -130,4 +139,28 @@ class BookValidator(BaseValidator):
             raise ValidationError(
                 f"A book can have a maximum of {cls.MAX_CATEGORIES} categories",
                 field="category_ids"
-            )
\ No newline at end of file
+            )
+    
+    @classmethod
+    def validate_fields(cls, fields: str) -> frozenset:
+        """
+        Validate a comma-separated sparse fieldset
+        
+        Args:
+            fields: Value of the fields query parameter
+            
+        Returns:
+            Set of requested field names, or None to return every field
+        """
+        if not fields:
+            return None
+        
+        requested = frozenset(f.strip() for f in fields.split(',') if f.strip())
+        unknown = requested - cls.FIELDS
+        if unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}",
+                field="fields"
+            )
+        
+        return requested
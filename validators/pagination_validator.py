@@ -4,6 +4,12 @@ Pagination validator - Validates pagination parameters
 Ensures valid pagination across all endpoints.
 """
 
+import binascii
+from base64 import urlsafe_b64decode
+from functools import lru_cache
+
+import orjson
+
 from exceptions import ValidationError
 from .base_validator import BaseValidator
 
@@ -19,10 +25,14 @@ class PaginationValidator(BaseValidator):
     DEFAULT_PER_PAGE = 10
     
     @classmethod
+    @lru_cache(maxsize=256)
     def validate_pagination(cls, page: int = None, per_page: int = None) -> tuple:
         """
         Validate and return pagination parameters
         
+        Results are memoized: nearly every request asks for one of a few
+        (page, per_page) pairs. Invalid pairs raise and are not cached.
+        
         Args:
             page: Page number
             per_page: Items per page
@@ -42,4 +52,28 @@ class PaginationValidator(BaseValidator):
                                    min_value=cls.MIN_PER_PAGE,
                                    max_value=cls.MAX_PER_PAGE)
         
-        return int(page), int(per_page)
\ No newline at end of file
+        return int(page), int(per_page)
+    
+    @classmethod
+    def validate_cursor(cls, cursor: str, *parsers) -> tuple:
+        """
+        Decode an opaque keyset pagination cursor
+        
+        Args:
+            cursor: Cursor from a previous page, or '' for the first page
+            parsers: One callable per sort key, converting the encoded
+                value back to the column's type
+            
+        Returns:
+            Tuple of sort key values, or None for the first page
+        """
+        if not cursor:
+            return None
+        
+        try:
+            values = orjson.loads(urlsafe_b64decode(cursor))
+            if not isinstance(values, list) or len(values) != len(parsers):
+                raise ValueError(cursor)
+            return tuple(parse(value) for parse, value in zip(parsers, values))
+        except (ValueError, TypeError, binascii.Error):
+            raise ValidationError(message="Invalid cursor", field='cursor')